@@ -0,0 +1,292 @@
+# benchmark.py
+# Offline micro-benchmarks for the hot paths (NO internet, NO browser)
+#
+#   python benchmark.py extractor [--lines 1000000]
+#   python benchmark.py scoring [--plans 100000]
+#   python benchmark.py infobox [saved_article.html ...]
+
+import argparse
+import json
+import random
+import re
+import time
+
+import customized_plan_extractor as cpe
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - started
+
+
+# ---------------------------------
+# Extractor: compiled classifier vs original per-line checks
+# ---------------------------------
+def _reference_is_valid_title(line):
+    # Original implementation, kept verbatim as the equivalence oracle
+    if len(line) < 10:
+        return False
+    if any(b.lower() in line.lower() for b in cpe.BLACKLIST_PHRASES):
+        return False
+    if "Rs." in line or "₹" in line:
+        return False
+    if "OFF" in line:
+        return False
+    if line.isupper():
+        return False
+    return True
+
+
+def _reference_plans(lines):
+    plans = []
+    current = None
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        if current is None and _reference_is_valid_title(line):
+            current = {
+                "Package Name": line, "Nights": None, "Days": None,
+                "Destinations": [], "Tour Type": None, "Facilities": [],
+                "Price Original": None, "Price Discounted": None, "Discount": None,
+            }
+            continue
+        if current is None:
+            continue
+
+        m = cpe.NIGHTS_RE.search(line)
+        if m:
+            current["Nights"] = m.group(1)
+            continue
+        m = cpe.DAYS_RE.search(line)
+        if m:
+            current["Days"] = m.group(1)
+            continue
+        if cpe.DEST_RE.match(line):
+            current["Destinations"].append(line)
+            continue
+        if line in ("Group Tour", "Customized Holidays"):
+            current["Tour Type"] = line
+            continue
+        if line in ("Flights", "Hotels", "Sightseeing", "Meals"):
+            if line not in current["Facilities"]:
+                current["Facilities"].append(line)
+            continue
+        if "Rs." in line or "₹" in line:
+            m = cpe.PRICE_RE.search(line)
+            if m:
+                price = cpe.clean_price(m.group(1))
+                if current["Price Original"] is None:
+                    current["Price Original"] = price
+                else:
+                    current["Price Discounted"] = price
+            continue
+        if cpe.DISCOUNT_RE.search(line):
+            current["Discount"] = line
+            continue
+        if line == "VIEW DETAILS":
+            if (current["Package Name"] and current["Nights"]
+                    and current["Days"] and current["Price Discounted"]):
+                plans.append(current)
+            current = None
+
+    return plans
+
+
+# Tricky lines: several patterns at once, odd spacing, case games
+_EDGE_LINES = [
+    "3 Nights 4 Days", "Rs. 5 Nights", "4 Days (2N)", "₹ 12 000 5% OFF",
+    "Rs. abc", "Rs.", "Nainital (2N) Rs. 12", "10% OFF 2 Days",
+    "LOGIN to book", "holidays in the hills", "A Very Long Package Title",
+    "COMPLETELY UPPER CASE TITLE", "Kedarnath\n(1N)", "Gangotri (1N)\nx",
+    "İstanbul Special Escape", "Short", "   ", "VIEW DETAILS", "Meals",
+]
+
+
+def _synthetic_lines(n, seed=7):
+    with open(cpe.INPUT_FILE, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    rng = random.Random(seed)
+    pool = base + _EDGE_LINES
+    out = []
+    while len(out) < n:
+        line = rng.choice(pool) if rng.random() < 0.15 else base[len(out) % len(base)]
+        # Perturb numbers so prices / nights vary
+        if rng.random() < 0.1:
+            line = re.sub(r"\d", lambda _: str(rng.randint(0, 9)), line)
+        out.append(line)
+    return out
+
+
+def bench_extractor(n_lines):
+    lines = _synthetic_lines(n_lines)
+    print(f"📄 {len(lines):,} synthetic lines")
+
+    ref, t_ref = _timed(_reference_plans, lines)
+    new, t_new = _timed(lambda ls: list(cpe.iter_plans(ls)), lines)
+
+    if ref != new:
+        raise SystemExit("❌ Compiled classifier output differs from reference parser")
+
+    print(f"✅ Identical output: {len(new):,} plans")
+    print(f"  reference : {t_ref:.2f}s")
+    print(f"  compiled  : {t_new:.2f}s")
+    print(f"  speedup   : {t_ref / t_new:.2f}x")
+
+
+# ---------------------------------
+# Scoring: NumPy catalogue pass vs per-plan functions
+# ---------------------------------
+def _synthetic_catalogue(n, seed=11):
+    with open(cpe.OUTPUT_FILE, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    places = sorted({
+        d.split("(")[0].strip() for p in base for d in p["Destinations"]
+    } | {"Unlisted Town"})
+    rng = random.Random(seed)
+    plans = []
+    for i in range(n):
+        p = dict(base[i % len(base)])
+        p["Nights"] = str(rng.randint(1, 9))
+        p["Tour Type"] = rng.choice(["Group Tour", "Customized Holidays", None])
+        p["Destinations"] = [
+            f"{rng.choice(places)} ({rng.randint(1, 3)}N)" for _ in range(rng.randint(1, 5))
+        ]
+        plans.append(p)
+    return plans
+
+
+def bench_scoring(n_plans, start_city="Delhi"):
+    import numpy  # noqa: F401 — keep import time out of the timings
+    from engine import family_scoring as fs
+
+    plans = _synthetic_catalogue(n_plans)
+    print(f"🧳 {len(plans):,} synthetic plans, start city {start_city}")
+
+    def per_plan(plans):
+        out = []
+        for p in plans:
+            first_place = p["Destinations"][0].split("(")[0].strip()
+            fatigue, _ = fs.travel_fatigue_by_road(start_city, first_place)
+            out.append((
+                fs.kid_friendliness(p),
+                fs.senior_friendliness(fatigue, int(p["Nights"])),
+                fs.family_score(p),
+                fatigue,
+            ))
+        return out
+
+    ref, t_ref = _timed(per_plan, plans)
+    cols, t_cols = _timed(fs.build_columns, plans, start_city)
+    scores, t_vec = _timed(fs.score_columns, cols)
+
+    vec = list(zip(
+        scores["kid"].tolist(),
+        scores["senior"].tolist(),
+        scores["family"].tolist(),
+        [fs.FATIGUE_LABELS[c] for c in scores["fatigue"].tolist()],
+    ))
+    if ref != vec:
+        raise SystemExit("❌ Vectorized scores differ from per-plan functions")
+
+    print("✅ Identical kid / senior / family scores and fatigue buckets")
+    print(f"  per-plan        : {t_ref:.3f}s")
+    print(f"  columns (build) : {t_cols:.3f}s")
+    print(f"  scoring (numpy) : {t_vec:.4f}s")
+    print(f"  speedup         : {t_ref / (t_cols + t_vec):.1f}x end-to-end, {t_ref / t_vec:.0f}x scoring only")
+
+
+# ---------------------------------
+# Infobox: targeted parse vs full-article tree
+# ---------------------------------
+def _synthetic_article(place, seed=3):
+    """
+    Wikipedia-shaped page (~400 KB): nav, a nested-table infobox,
+    long body, navboxes and data tables after it.
+    """
+    rng = random.Random(seed)
+    words = "river temple valley district hill station pilgrims monsoon trek".split()
+
+    def para():
+        return "<p>" + " ".join(rng.choice(words) for _ in range(120)) + "</p>"
+
+    nav = "<div id='mw-navigation'>" + "".join(
+        f"<a href='/wiki/L{i}'>Link {i}</a>" for i in range(400)
+    ) + "</div>"
+    infobox = (
+        '<table class="infobox ib-settlement vcard"><tbody>'
+        f'<tr><th colspan="2" class="infobox-above">{place}</th></tr>'
+        '<tr><td colspan="2"><table class="nested"><tr><td>map</td></tr></table></td></tr>'
+        '<tr><th scope="row">Elevation</th><td>2,084&#160;m (6,837&#160;ft)</td></tr>'
+        '<tr><th scope="row">Population <span>(2011)</span></th><td>41,377</td></tr>'
+        '<tr><th scope="row">Official languages</th><td>Hindi<br/>Sanskrit</td></tr>'
+        '<tr><th>Additional languages</th><td>Kumaoni, English</td></tr>'
+        "</tbody></table>"
+    )
+    tables = "".join(
+        "<table class='wikitable'>" + "".join(
+            f"<tr><th>Row {r}</th><td>{rng.randint(0, 10**6):,}</td></tr>" for r in range(40)
+        ) + "</table>"
+        for _ in range(15)
+    )
+    body = "".join(para() for _ in range(350))
+    return f"<html><head><title>{place}</title></head><body>{nav}{infobox}{body}{tables}</body></html>"
+
+
+def bench_infobox(paths, repeat=5):
+    from engine.sources import wikipedia_source as ws
+
+    pages = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((path, f.read()))
+    if not pages:
+        pages = [("synthetic:Nainital", _synthetic_article("Nainital"))]
+
+    print(f"🧩 fast parser: {ws.FAST_PARSER}")
+    for name, html in pages:
+        full = ws.parse_place_facts(html, fast=False)
+        fast = ws.parse_place_facts(html, fast=True)
+        full.pop("fetched_at")
+        fast.pop("fetched_at")
+        if full != fast:
+            raise SystemExit(f"❌ {name}: targeted parse differs: {fast} != {full}")
+
+        _, t_full = _timed(lambda: [ws.parse_place_facts(html, fast=False) for _ in range(repeat)])
+        _, t_fast = _timed(lambda: [ws.parse_place_facts(html, fast=True) for _ in range(repeat)])
+        print(f"✅ {name} ({len(html) / 1e3:.0f} KB) identical: {fast}")
+        print(f"  full tree : {t_full / repeat * 1e3:.1f} ms")
+        print(f"  targeted  : {t_fast / repeat * 1e3:.2f} ms  ({t_full / t_fast:.0f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks.")
+    sub = parser.add_subparsers(dest="target", required=True)
+
+    p = sub.add_parser("extractor", help="line classifier equivalence + speed")
+    p.add_argument("--lines", type=int, default=1_000_000)
+
+    p = sub.add_parser("scoring", help="NumPy catalogue scoring equivalence + speed")
+    p.add_argument("--plans", type=int, default=100_000)
+    p.add_argument("--start-city", default="Delhi")
+
+    p = sub.add_parser("infobox", help="targeted infobox parse equivalence + speed")
+    p.add_argument("html", nargs="*", help="saved article pages (default: synthetic page)")
+
+    args = parser.parse_args(argv)
+
+    if args.target == "extractor":
+        bench_extractor(args.lines)
+    elif args.target == "scoring":
+        bench_scoring(args.plans, args.start_city)
+    elif args.target == "infobox":
+        bench_infobox(args.html)
+
+
+if __name__ == "__main__":
+    main()
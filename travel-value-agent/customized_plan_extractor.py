@@ -3,13 +3,23 @@
 # ARCHITECTURE SAFE — single parser, VIEW DETAILS driven
 # No transport bias | No stale assumptions | No hardcoding
 
+import argparse
+import contextlib
+import glob
 import json
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.atomic_io import atomic_open, atomic_write_json, file_sha256
 
 INPUT_FILE = "scraped_output.json"
 OUTPUT_DIR = "data"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "valid_plans.json")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+# Optional indexed copy of the plans (--sqlite), read by main.py if present
+PLAN_DB_FILE = os.path.join(OUTPUT_DIR, "valid_plans.sqlite")
 
 # -------------------------
 # Regex patterns
@@ -57,6 +67,11 @@ BLACKLIST_PHRASES = [
     "Get a Quote",
 ]
 
+# One alternation over the lowered phrases, searched on a single
+# line.lower() — exactly `any(b.lower() in line.lower() ...)`.
+_BLACKLIST_RE = re.compile("|".join(re.escape(b.lower()) for b in BLACKLIST_PHRASES))
+_TITLE_REJECT_RE = re.compile(r"Rs\.|₹|OFF")
+
 def is_valid_title(line: str) -> bool:
     """
     Strict title detector.
@@ -68,13 +83,11 @@ def is_valid_title(line: str) -> bool:
     if len(line) < 10:
         return False
 
-    if any(b.lower() in line.lower() for b in BLACKLIST_PHRASES):
+    if _BLACKLIST_RE.search(line.lower()):
         return False
 
-    if "Rs." in line or "₹" in line:
-        return False
-
-    if "OFF" in line:
+    # Prices ("Rs." / "₹") and discounts ("OFF")
+    if _TITLE_REJECT_RE.search(line):
         return False
 
     if line.isupper():
@@ -83,18 +96,157 @@ def is_valid_title(line: str) -> bool:
     return True
 
 
+# -------------------------
+# Compiled single-pass line classifier
+# -------------------------
+# Exact-match lines (none of them can match a field pattern)
+_LITERAL_KINDS = {
+    "Group Tour": "tour_type",
+    "Customized Holidays": "tour_type",
+    "Flights": "facility",
+    "Hotels": "facility",
+    "Sightseeing": "facility",
+    "Meals": "facility",
+    "VIEW DETAILS": "end",
+}
+
+# One scan finds every literal "trigger" a field pattern needs; only the
+# patterns whose trigger is present are then confirmed, in the parser's
+# original priority order. Most lines have no trigger and stop here.
+_TRIGGER_RE = re.compile(r"Nights|Days|N\)|Rs\.|₹|% OFF")
+
+
+def classify_line(line: str):
+    """
+    Decide what a (stripped, non-empty) line is in one pass.
+    Returns (kind, value); kind is None for lines the parser ignores.
+    """
+    kind = _LITERAL_KINDS.get(line)
+    if kind:
+        return kind, line
+
+    triggers = _TRIGGER_RE.findall(line)
+    if not triggers:
+        return None, None
+    triggers = set(triggers)
+
+    if "Nights" in triggers:
+        m = NIGHTS_RE.search(line)
+        if m:
+            return "nights", m.group(1)
+
+    if "Days" in triggers:
+        m = DAYS_RE.search(line)
+        if m:
+            return "days", m.group(1)
+
+    if "N)" in triggers and DEST_RE.match(line):
+        return "dest", line
+
+    if "Rs." in triggers or "₹" in triggers:
+        m = PRICE_RE.search(line)
+        return "price", (m.group(1) if m else None)
+
+    if "% OFF" in triggers and DISCOUNT_RE.search(line):
+        return "discount", line
+
+    return None, None
+
+
 def clean_price(text: str) -> str:
     return re.sub(r"[^\d]", "", text)
 
 
-def extract():
-    if not os.path.exists(INPUT_FILE):
-        raise FileNotFoundError("❌ scraped_output.json not found")
+# -------------------------
+# Streaming input readers
+# -------------------------
+_WS_RE = re.compile(r"\s*")
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """
+    Yield the elements of a top-level JSON array one at a time,
+    reading `f` in chunks (constant memory, any file size).
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    state = "start"  # start → first → (item ↔ after)
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        lines = json.load(f)
+    while True:
+        # Skip whitespace, refilling across chunk boundaries
+        while True:
+            pos = _WS_RE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                break
+            fill()
 
-    plans = []
+        if pos >= len(buf):
+            raise ValueError("❌ Unexpected end of JSON array")
+
+        ch = buf[pos]
+        if state == "start":
+            if ch != "[":
+                raise ValueError("❌ Expected a JSON array of lines")
+            pos += 1
+            state = "first"
+            continue
+
+        if ch == "]" and state in ("first", "after"):
+            return
+
+        if state == "after":
+            if ch != ",":
+                raise ValueError(f"❌ Expected ',' in JSON array, got {ch!r}")
+            pos += 1
+            state = "item"
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A number cut at the chunk edge ("12|3", "2|.5") decodes
+                # "successfully" — only trust it once followed by a delimiter
+                if eof or (end < len(buf) and buf[end] not in _NUMBER_TAIL):
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            fill()
+
+        pos = end
+        state = "after"
+        yield value
+
+
+def iter_ndjson(f):
+    """
+    One JSON value (a scraped line) per input line.
+    """
+    for raw in f:
+        raw = raw.strip()
+        if raw:
+            yield json.loads(raw)
+
+
+# -------------------------
+# Incremental parser
+# -------------------------
+def iter_plans(lines):
+    """
+    Consume scraped lines one at a time and yield each complete plan
+    as soon as its "VIEW DETAILS" terminator is seen.
+    """
     current = None
 
     for raw in lines:
@@ -122,37 +274,37 @@ def extract():
         if current is None:
             continue
 
+        kind, value = classify_line(line)
+
         # -----------------------------
         # 2️⃣ Nights / Days
         # -----------------------------
-        m = NIGHTS_RE.search(line)
-        if m:
-            current["Nights"] = m.group(1)
+        if kind == "nights":
+            current["Nights"] = value
             continue
 
-        m = DAYS_RE.search(line)
-        if m:
-            current["Days"] = m.group(1)
+        if kind == "days":
+            current["Days"] = value
             continue
 
         # -----------------------------
         # 3️⃣ Destinations
         # -----------------------------
-        if DEST_RE.match(line):
+        if kind == "dest":
             current["Destinations"].append(line)
             continue
 
         # -----------------------------
         # 4️⃣ Tour Type
         # -----------------------------
-        if line in ("Group Tour", "Customized Holidays"):
+        if kind == "tour_type":
             current["Tour Type"] = line
             continue
 
         # -----------------------------
         # 5️⃣ Facilities
         # -----------------------------
-        if line in ("Flights", "Hotels", "Sightseeing", "Meals"):
+        if kind == "facility":
             if line not in current["Facilities"]:
                 current["Facilities"].append(line)
             continue
@@ -160,10 +312,9 @@ def extract():
         # -----------------------------
         # 6️⃣ Prices
         # -----------------------------
-        if "Rs." in line or "₹" in line:
-            m = PRICE_RE.search(line)
-            if m:
-                price = clean_price(m.group(1))
+        if kind == "price":
+            if value is not None:
+                price = clean_price(value)
                 if current["Price Original"] is None:
                     current["Price Original"] = price
                 else:
@@ -173,33 +324,325 @@ def extract():
         # -----------------------------
         # 7️⃣ Discount
         # -----------------------------
-        if DISCOUNT_RE.search(line):
+        if kind == "discount":
             current["Discount"] = line
             continue
 
         # -----------------------------
         # 8️⃣ END OF PLAN (ONLY TRUSTED SIGNAL)
         # -----------------------------
-        if line == "VIEW DETAILS":
+        if kind == "end":
             if (
                 current["Package Name"]
                 and current["Nights"]
                 and current["Days"]
                 and current["Price Discounted"]
             ):
-                plans.append(current)
+                yield current
             current = None
 
+
+# -------------------------
+# Incremental manifest
+# -------------------------
+# <output>.manifest.json remembers, per scraped input, its content hash and
+# the plans it produced. Unchanged inputs are never reparsed; if nothing
+# changed (and the output is still what we wrote) the run is a no-op.
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(output_file):
+    return os.path.splitext(output_file)[0] + ".manifest.json"
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _parse_files(paths, workers=None):
+    if not paths:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers == 1:
+        return [extract_file(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_file, paths))
+
+
+def extract_incremental(paths, output_file, workers=None, dedupe=False, force=False):
+    """
+    Re-extract only inputs whose content hash changed, then rebuild and
+    atomically replace `output_file`. Returns a summary dict; when
+    nothing changed, summary["up_to_date"] is True and nothing is written.
+    """
+    manifest_file = manifest_path_for(output_file)
+    manifest = (None if force else _load_manifest(manifest_file)) or {}
+    cached = manifest.get("sources", {})
+
+    hashes = {p: file_sha256(p) for p in paths}
+    changed = [p for p in paths if cached.get(p, {}).get("sha256") != hashes[p]]
+
+    output_intact = (
+        os.path.exists(output_file)
+        and manifest.get("output_sha256") == file_sha256(output_file)
+    )
+    if not changed and set(paths) == set(cached) and output_intact:
+        return {"up_to_date": True, "parsed": [], "reused": list(paths), "plans": None}
+
+    fresh = dict(_parse_files(changed, workers))
+    results = [(p, fresh[p] if p in fresh else cached[p]["plans"]) for p in paths]
+
+    provenance = None
+    if dedupe:
+        plans, provenance = merge_plans(results)
+    else:
+        plans = [plan for _, source_plans in results for plan in source_plans]
+
+    atomic_write_json(output_file, plans)
+    if provenance is not None:
+        atomic_write_json(provenance_path_for(output_file), provenance)
+
+    atomic_write_json(manifest_file, {
+        "version": MANIFEST_VERSION,
+        "output_sha256": file_sha256(output_file),
+        "sources": {
+            p: {"sha256": hashes[p], "plans": source_plans}
+            for p, source_plans in results
+        },
+    })
+
+    return {
+        "up_to_date": False,
+        "parsed": changed,
+        "reused": [p for p in paths if p not in fresh],
+        "plans": plans,
+    }
+
+
+def sync_sqlite(plans, output_file, db_file):
+    """
+    Mirror the extracted plans into the SQLite store (incremental upsert).
+    `plans` is None when the JSON was already up to date.
+    """
+    from engine.plan_store import sync_plans
+
+    if plans is None:
+        with open(output_file, "r", encoding="utf-8") as f:
+            plans = json.load(f)
+
+    counts = sync_plans(plans, db_file)
+    print(
+        f"🗄 SQLite store {db_file}: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['deleted']} deleted, {counts['unchanged']} unchanged"
+    )
+
+
+def extract(force=False, sqlite_file=None):
+    if not os.path.exists(INPUT_FILE):
+        raise FileNotFoundError("❌ scraped_output.json not found")
+
     # -----------------------------
-    # 9️⃣ Persist
+    # 9️⃣ Persist (skipped when the scrape is unchanged)
     # -----------------------------
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(plans, f, indent=2, ensure_ascii=False)
+    summary = extract_incremental([INPUT_FILE], OUTPUT_FILE, force=force)
+    if summary["up_to_date"]:
+        print(f"⏭ {INPUT_FILE} unchanged — {OUTPUT_FILE} is up to date")
+    else:
+        print(f"✅ Extracted {len(summary['plans'])} valid travel plans")
+        print(f"📁 Output written to {OUTPUT_FILE}")
+
+    if sqlite_file:
+        sync_sqlite(summary["plans"], OUTPUT_FILE, sqlite_file)
+
+
+# -------------------------
+# Streaming / NDJSON mode
+# -------------------------
+def _open_in(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, "r", encoding="utf-8")
+
+
+def _open_out(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    # Temp file + os.replace: readers never see a half-written output
+    return atomic_open(path, "w")
+
+
+def extract_stream(input_path, output_path, ndjson_in=False, ndjson_out=True):
+    """
+    Constant-memory extraction. Plans are written as soon as they close,
+    so the output can be piped straight into a consumer ("-" = stdio).
+    With ndjson_out=False the output is the usual JSON list, still
+    written incrementally. A file output only appears once complete.
+    """
+    count = 0
+
+    with _open_in(input_path) as fin, _open_out(output_path) as fout:
+        lines = iter_ndjson(fin) if ndjson_in else iter_json_array(fin)
+
+        if not ndjson_out:
+            fout.write("[")
+
+        for plan in iter_plans(lines):
+            if ndjson_out:
+                fout.write(json.dumps(plan, ensure_ascii=False) + "\n")
+                if output_path == "-":
+                    fout.flush()
+            else:
+                body = json.dumps(plan, indent=2, ensure_ascii=False)
+                fout.write(("," if count else "") + "\n  " + body.replace("\n", "\n  "))
+            count += 1
+
+        if not ndjson_out:
+            fout.write("\n]" if count else "]")
+
+    # Keep stdout clean for piping
+    print(f"✅ Extracted {count} valid travel plans", file=sys.stderr)
+    return count
+
+
+# -------------------------
+# Batch mode (many scraped files, process pool)
+# -------------------------
+def expand_inputs(specs):
+    """
+    Directories expand to their *.json / *.ndjson / *.jsonl files,
+    anything else is treated as a glob. Order is stable, duplicates dropped.
+    """
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            found = [
+                os.path.join(spec, f) for f in os.listdir(spec)
+                if f.endswith((".json",) + NDJSON_SUFFIXES)
+            ]
+        else:
+            found = glob.glob(spec)
+        paths.extend(sorted(found))
+    return list(dict.fromkeys(paths))
+
+
+def extract_file(path):
+    """
+    Worker: parse one scraped file. Returns (path, plans).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = iter_ndjson(f) if path.endswith(NDJSON_SUFFIXES) else iter_json_array(f)
+        return path, list(iter_plans(lines))
+
+
+def plan_key(plan):
+    return (plan["Package Name"], plan["Nights"], plan["Price Discounted"])
+
+
+def merge_plans(results):
+    """
+    results: [(source, plans), ...] in input order.
+    Duplicates (same name, nights, discounted price) keep the first copy;
+    every source that produced the plan is recorded.
+    """
+    merged = {}
+    sources = {}
+    for source, plans in results:
+        for plan in plans:
+            key = plan_key(plan)
+            if key not in merged:
+                merged[key] = plan
+                sources[key] = []
+            if source not in sources[key]:
+                sources[key].append(source)
+
+    provenance = [
+        {
+            "Package Name": key[0],
+            "Nights": key[1],
+            "Price Discounted": key[2],
+            "sources": sources[key],
+        }
+        for key in merged
+    ]
+    return list(merged.values()), provenance
+
+
+def provenance_path_for(output_file):
+    # Batch mode: which scraped sources each merged plan came from.
+    # Kept beside the output so the frozen data contract is untouched.
+    return os.path.splitext(output_file)[0] + ".sources.json"
+
+
+def extract_batch(specs, output_file=OUTPUT_FILE, workers=None, force=False, sqlite_file=None):
+    paths = expand_inputs(specs)
+    if not paths:
+        raise FileNotFoundError(f"❌ No scraped inputs match {specs}")
+
+    summary = extract_incremental(paths, output_file, workers=workers, dedupe=True, force=force)
+    if sqlite_file:
+        sync_sqlite(summary["plans"], output_file, sqlite_file)
+
+    if summary["up_to_date"]:
+        print(f"⏭ {len(paths)} scraped file(s) unchanged — {output_file} is up to date")
+        return None
+
+    plans = summary["plans"]
+    print(
+        f"✅ {len(plans)} unique plans from {len(paths)} file(s): "
+        f"{len(summary['parsed'])} parsed, {len(summary['reused'])} unchanged"
+    )
+    print(f"📁 Output written to {output_file}")
+    print(f"🧾 Provenance written to {provenance_path_for(output_file)}")
+    return plans
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract travel plans from scraped lines.")
+    parser.add_argument("--input", help="scraped lines (JSON array, or NDJSON with --ndjson-in); '-' = stdin")
+    parser.add_argument("--output", help="plans output; '-' = stdout")
+    parser.add_argument("--ndjson-in", action="store_true", help="input has one JSON line per record")
+    parser.add_argument("--ndjson-out", action="store_true", help="write one plan per line")
+    parser.add_argument("--batch", nargs="+", metavar="DIR_OR_GLOB",
+                        help="extract many scraped files in parallel and merge")
+    parser.add_argument("--workers", type=int, help="batch worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and reparse everything")
+    parser.add_argument("--sqlite", nargs="?", const=PLAN_DB_FILE, metavar="DB",
+                        help=f"also upsert plans into a SQLite store (default: {PLAN_DB_FILE}); "
+                             "not available with streaming output")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        extract_batch(
+            args.batch,
+            output_file=args.output or OUTPUT_FILE,
+            workers=args.workers,
+            force=args.force,
+            sqlite_file=args.sqlite,
+        )
+        return
+
+    # No streaming options → original batch behaviour
+    if not (args.input or args.output or args.ndjson_in or args.ndjson_out):
+        extract(force=args.force, sqlite_file=args.sqlite)
+        return
+
+    if args.sqlite:
+        parser.error("--sqlite needs the JSON list output (use it without the streaming options)")
 
-    print(f"✅ Extracted {len(plans)} valid travel plans")
-    print(f"📁 Output written to {OUTPUT_FILE}")
+    extract_stream(
+        args.input or INPUT_FILE,
+        args.output or OUTPUT_FILE,
+        ndjson_in=args.ndjson_in,
+        ndjson_out=args.ndjson_out,
+    )
 
 
 if __name__ == "__main__":
-    extract()
+    main()
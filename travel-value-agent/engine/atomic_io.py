@@ -0,0 +1,66 @@
+# engine/atomic_io.py
+# Crash-safe file writes: readers (e.g. the Streamlit app) only ever see
+# the old file or the complete new one, never a half-written one.
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """
+    Write to a temp file in the same directory, fsync, then os.replace().
+    """
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+@contextlib.contextmanager
+def atomic_open(path: str, mode: str = "w", encoding: str = "utf-8"):
+    """
+    Streaming counterpart of atomic_write_bytes(): write through the
+    yielded file object; it replaces `path` only if the block completes.
+    """
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=parent)
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write_json(path: str, data, indent=2, ensure_ascii=False):
+    text = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,252 @@
+# engine/distance_store.py
+# Single source of road km + driving hours for every agent
+#
+# Compiled from the tables in engine.road_distance_agent:
+#   - CITY_DISTANCES_KM  exact listed pairs (always win, both directions)
+#   - HUB_EDGES_KM       connector roads → shortest paths for everything else
+#   - ROAD_TIME_HR       measured (km, hours) → that road's speed applied to
+#                        the compiled km (else km / AVG_SPEED_KMPH)
+#
+# Cities get interned integer ids; km and hours live in flat n×n `array`
+# matrices, so a lookup is two dict hits and one index. The compiled form
+# ships as data/road_distances.bin and is rebuilt in memory if the source
+# tables changed since it was written.
+#
+#   python -m engine.distance_store     # rewrite data/road_distances.bin
+
+import hashlib
+import heapq
+import json
+import struct
+import sys
+import threading
+from array import array
+
+from engine.atomic_io import atomic_write_bytes
+
+STORE_FILE = "data/road_distances.bin"
+
+MAGIC = b"TVAD"
+# Bump when the file layout or the compile rules change (stale .bin files
+# are then recompiled instead of loaded)
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sHI20sI")  # magic, version, n cities, sha1, names bytes
+
+UNKNOWN = -1  # matrix cell for "no road known"
+
+# Plains + hill roads; matches the measured Delhi→Dehradun ≈ 6 h
+AVG_SPEED_KMPH = 40
+
+
+# -------------------------------------------------
+# COMPILE
+# -------------------------------------------------
+def _source_tables():
+    from engine.road_distance_agent import CITY_DISTANCES_KM, HUB_EDGES_KM, ROAD_TIME_HR
+    return CITY_DISTANCES_KM, HUB_EDGES_KM, ROAD_TIME_HR
+
+
+def source_fingerprint(tables=None):
+    """
+    sha1 over the source tables (20 bytes); a stale .bin is ignored.
+    """
+    tables = tables or _source_tables()
+    canon = [sorted([a, b, v] for (a, b), v in t.items()) for t in tables]
+    blob = json.dumps([FORMAT_VERSION, AVG_SPEED_KMPH, canon]).encode("utf-8")
+    return hashlib.sha1(blob).digest()
+
+
+def _shortest_paths(graph, source):
+    dist = {source: 0}
+    heap = [(0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        for nxt, km in graph[node].items():
+            nd = d + km
+            if nd < dist.get(nxt, float("inf")):
+                dist[nxt] = nd
+                heapq.heappush(heap, (nd, nxt))
+    return dist
+
+
+def compile_store(tables=None):
+    """
+    Source tables → DistanceStore. Hours are kept in tenths (int) so the
+    matrices stay integer and round-trip exactly.
+    """
+    listed, hubs, hours = tables or _source_tables()
+
+    # Roads are undirected: every pair is stored in both directions, and
+    # a listed pair is an exact edge that replaces any hub edge for it
+    graph = {}
+    for (a, b), km in hubs.items():
+        for u, v in ((a, b), (b, a)):
+            edges = graph.setdefault(u, {})
+            edges[v] = min(km, edges.get(v, km))
+    for (a, b), km in listed.items():
+        graph.setdefault(a, {})[b] = km
+        graph.setdefault(b, {})[a] = km
+    for a, b in hours:
+        graph.setdefault(a, {})
+        graph.setdefault(b, {})
+
+    names = sorted(graph)
+    ids = {name: i for i, name in enumerate(names)}
+    n = len(names)
+
+    km = array("i", [UNKNOWN]) * (n * n)
+    for a in names:
+        row = ids[a] * n
+        for b, d in _shortest_paths(graph, a).items():
+            km[row + ids[b]] = d
+    for (a, b), d in listed.items():
+        km[ids[a] * n + ids[b]] = d
+        km[ids[b] * n + ids[a]] = d
+
+    tenths = array("i", [UNKNOWN]) * (n * n)
+    for cell, d in enumerate(km):
+        if d != UNKNOWN:
+            tenths[cell] = round(d * 10 / AVG_SPEED_KMPH)
+    for (a, b), (measured_km, hrs) in hours.items():
+        d = km[ids[a] * n + ids[b]]
+        if d != UNKNOWN:
+            t = round(hrs * 10 * d / measured_km)
+            tenths[ids[a] * n + ids[b]] = t
+            tenths[ids[b] * n + ids[a]] = t
+
+    return DistanceStore(names, km, tenths, source_fingerprint((listed, hubs, hours)))
+
+
+# -------------------------------------------------
+# STORE
+# -------------------------------------------------
+class DistanceStore:
+    """
+    Read-only km / hours matrices indexed by interned city id.
+    """
+
+    __slots__ = ("names", "ids", "km", "tenths", "fingerprint", "_n")
+
+    def __init__(self, names, km, tenths, fingerprint):
+        self.names = tuple(sys.intern(name) for name in names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.km = km
+        self.tenths = tenths
+        self.fingerprint = fingerprint
+        self._n = len(self.names)
+
+    def __len__(self):
+        return self._n
+
+    def city_id(self, name):
+        return self.ids.get(name)
+
+    def _cell(self, a, b):
+        i = self.ids.get(a)
+        j = self.ids.get(b)
+        if i is None or j is None:
+            return None
+        return i * self._n + j
+
+    def km_between(self, a, b):
+        """
+        km (int) or None if unknown.
+        """
+        cell = self._cell(a, b)
+        if cell is None:
+            return None
+        d = self.km[cell]
+        return None if d == UNKNOWN else d
+
+    def hours_between(self, a, b):
+        """
+        Driving hours (int or one-decimal float) or None if unknown.
+        """
+        cell = self._cell(a, b)
+        if cell is None:
+            return None
+        t = self.tenths[cell]
+        if t == UNKNOWN:
+            return None
+        return t // 10 if t % 10 == 0 else t / 10
+
+    def lookup(self, a, b):
+        return self.km_between(a, b), self.hours_between(a, b)
+
+    # -------------------------
+    # Binary form
+    # -------------------------
+    def to_bytes(self):
+        names = "\n".join(self.names).encode("utf-8")
+        km, tenths = array("i", self.km), array("i", self.tenths)
+        if sys.byteorder == "big":
+            km.byteswap()
+            tenths.byteswap()
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, self._n, self.fingerprint, len(names))
+        return header + names + km.tobytes() + tenths.tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, version, n, fingerprint, names_len = _HEADER.unpack_from(blob)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("not a road distance store (or an older format)")
+
+        pos = _HEADER.size
+        names = blob[pos:pos + names_len].decode("utf-8").split("\n") if n else []
+        pos += names_len
+
+        size = n * n * 4
+        if len(blob) != pos + 2 * size or len(names) != n:
+            raise ValueError("truncated road distance store")
+
+        km, tenths = array("i"), array("i")
+        km.frombytes(blob[pos:pos + size])
+        tenths.frombytes(blob[pos + size:pos + 2 * size])
+        if sys.byteorder == "big":
+            km.byteswap()
+            tenths.byteswap()
+        return cls(names, km, tenths, fingerprint)
+
+
+def write_store(path=STORE_FILE, store=None):
+    store = store or compile_store()
+    atomic_write_bytes(path, store.to_bytes())
+    return store
+
+
+def load_store(path=STORE_FILE):
+    """
+    Prebuilt file if it matches the current source tables, else compile.
+    """
+    try:
+        with open(path, "rb") as f:
+            store = DistanceStore.from_bytes(f.read())
+    except (OSError, ValueError, struct.error):
+        return compile_store()
+
+    if store.fingerprint != source_fingerprint():
+        return compile_store()
+    return store
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Shared store, loaded on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = load_store()
+    return _store
+
+
+if __name__ == "__main__":
+    s = write_store()
+    print(f"✅ {len(s)} cities, {len(s.to_bytes()):,} bytes → {STORE_FILE}")
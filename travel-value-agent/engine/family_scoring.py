@@ -0,0 +1,159 @@
+# engine/family_scoring.py
+# Family / kid / senior scoring rules (Step 8B decision logic)
+#
+# Per-plan functions are the reference rules used by the UI.
+# score_catalogue() applies the SAME rules to a whole catalogue at once
+# with NumPy columns, so large catalogues can be ranked before rendering.
+
+from engine.road_distance_agent import get_road_distance
+from engine.itinerary_agent import evaluate_itineraries
+from schema.output_schema import Plan
+
+# -------------------------------------------------
+# PER-PLAN RULES
+# -------------------------------------------------
+def travel_fatigue_by_road(start_city, first_place):
+    km = get_road_distance(start_city, first_place)
+    if km is None:
+        return "Unknown", None
+
+    if km < 200:
+        return "Low", km
+    elif km <= 400:
+        return "Medium", km
+    else:
+        return "High", km
+
+
+def senior_friendliness(fatigue, nights):
+    score = 5
+    if fatigue == "High":
+        score -= 2
+    if nights <= 3:
+        score -= 1
+    return max(score, 1)
+
+
+def kid_friendliness(plan):
+    score = 5
+    if int(plan["Nights"]) <= 3:
+        score -= 1
+    if len(plan.get("Destinations", [])) >= 4:
+        score -= 2
+    if plan.get("Tour Type") == "Group Tour":
+        score -= 1
+    return max(score, 1)
+
+
+def family_score(plan):
+    score = 50
+    score += kid_friendliness(plan) * 5
+    return score
+
+
+# -------------------------------------------------
+# COLUMNAR (WHOLE CATALOGUE) SCORING
+# -------------------------------------------------
+FATIGUE_LABELS = ("Unknown", "Low", "Medium", "High")
+FATIGUE_UNKNOWN, FATIGUE_LOW, FATIGUE_MEDIUM, FATIGUE_HIGH = range(4)
+
+
+def build_columns(plans, start_city, fatigue_by="first_leg", routes=None):
+    """
+    Plans (contract dicts or Plan records) → NumPy columns. Road distance
+    is looked up once per unique first place; unknown distances (or plans
+    without destinations) are NaN.
+
+    fatigue_by="route" buckets fatigue on the longest driving day of the
+    whole itinerary (engine.itinerary_agent) instead of the first leg.
+    Pass `routes` (evaluate_itineraries() output aligned with `plans`) if
+    the caller already has them, so they are not evaluated twice.
+    """
+    import numpy as np
+
+    nights, dest_count, is_group, first_places = [], [], [], []
+    for p in plans:
+        if isinstance(p, Plan):
+            # Already parsed once
+            nights.append(p.nights)
+            dest_count.append(len(p.destinations))
+            is_group.append(p.tour_type == "Group Tour")
+            first_places.append(p.first_place)
+            continue
+
+        dests = p.get("Destinations", [])
+        nights.append(int(p["Nights"]))
+        dest_count.append(len(dests))
+        is_group.append(p.get("Tour Type") == "Group Tour")
+        first_places.append(dests[0].split("(")[0].strip() if dests else None)
+
+    km_by_place = {
+        place: get_road_distance(start_city, place)
+        for place in set(first_places) if place is not None
+    }
+    nan = float("nan")
+    first_leg_km = [km_by_place.get(place) for place in first_places]
+
+    if fatigue_by == "route":
+        if routes is None:
+            routes = evaluate_itineraries(plans, start_city)
+        fatigue_km = [None if r["fatigue"] == "Unknown" else r["max_day_km"] for r in routes]
+    else:
+        fatigue_km = first_leg_km
+
+    return {
+        "nights": np.array(nights, dtype=np.int32),
+        "dest_count": np.array(dest_count, dtype=np.int32),
+        "is_group": np.array(is_group, dtype=bool),
+        "first_leg_km": np.array(
+            [nan if km is None else km for km in first_leg_km], dtype=np.float64
+        ),
+        "fatigue_km": np.array(
+            [nan if km is None else km for km in fatigue_km], dtype=np.float64
+        ),
+    }
+
+
+def score_columns(cols):
+    """
+    Batched equivalent of kid_friendliness / travel_fatigue_by_road /
+    senior_friendliness / family_score. Returns int arrays; "fatigue" holds
+    codes into FATIGUE_LABELS.
+    """
+    import numpy as np
+
+    nights = cols["nights"]
+    short_trip = nights <= 3
+
+    kid = 5 - short_trip - 2 * (cols["dest_count"] >= 4) - cols["is_group"]
+    kid = np.maximum(kid, 1).astype(np.int32)
+
+    km = cols["fatigue_km"]
+    known = ~np.isnan(km)
+    km_filled = np.where(known, km, 0.0)
+    fatigue = np.select(
+        [~known, km_filled < 200, km_filled <= 400],
+        [FATIGUE_UNKNOWN, FATIGUE_LOW, FATIGUE_MEDIUM],
+        default=FATIGUE_HIGH,
+    ).astype(np.int8)
+
+    senior = 5 - 2 * (fatigue == FATIGUE_HIGH) - short_trip
+    senior = np.maximum(senior, 1).astype(np.int32)
+
+    family = (50 + kid * 5).astype(np.int32)
+
+    return {
+        "kid": kid,
+        "senior": senior,
+        "family": family,
+        "fatigue": fatigue,
+        "first_leg_km": cols["first_leg_km"],
+    }
+
+
+def score_catalogue(plans, start_city, fatigue_by="first_leg", routes=None):
+    """
+    Score every plan in one batched pass (same rules as the per-plan
+    functions). Arrays are aligned with `plans`.
+    """
+    return score_columns(build_columns(plans, start_city, fatigue_by, routes))
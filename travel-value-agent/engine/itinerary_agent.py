@@ -0,0 +1,88 @@
+# engine/itinerary_agent.py
+# Whole-itinerary road cost: start city → every destination, leg by leg
+#
+# "Destinations" entries look like "Dehradun (1N)". Each leg is driven on
+# its own day (arrival day, then after each stop's nights), so the longest
+# leg is the hardest driving day.
+
+from engine.road_distance_agent import get_road_distance, get_road_time
+from schema.output_schema import Plan, split_destination
+
+# "Dehradun (1N)" → ("Dehradun", 1)
+parse_destination = split_destination
+
+
+def _stops(plan):
+    # Plan records carry pre-split destinations; dicts are parsed here
+    if isinstance(plan, Plan):
+        return plan.destinations
+    return [parse_destination(d) for d in plan.get("Destinations", [])]
+
+
+def fatigue_for_km(km):
+    # Same thresholds as the first-leg rule in engine.family_scoring
+    if km is None:
+        return "Unknown"
+    if km < 200:
+        return "Low"
+    if km <= 400:
+        return "Medium"
+    return "High"
+
+
+def evaluate_itinerary(plan, start_city, leg_cache=None):
+    """
+    Route cost for one plan (contract dict or Plan). `leg_cache` ({(a, b): (km, hours)}) can be
+    shared across plans so every distinct leg is looked up once.
+    """
+    if leg_cache is None:
+        leg_cache = {}
+
+    stops = _stops(plan)
+    route = [start_city] + [place for place, _ in stops]
+
+    legs = []
+    for a, b in zip(route, route[1:]):
+        key = (a, b)
+        if key not in leg_cache:
+            leg_cache[key] = (get_road_distance(a, b), get_road_time(a, b))
+        legs.append((a, b) + leg_cache[key])
+
+    known = [(km, hrs) for _, _, km, hrs in legs if km is not None]
+    unknown_legs = len(legs) - len(known)
+    max_day_km = max(km for km, _ in known) if known else None
+
+    # A known High day is High whatever the missing legs are
+    if unknown_legs and (max_day_km is None or fatigue_for_km(max_day_km) != "High"):
+        fatigue = "Unknown"
+    else:
+        fatigue = fatigue_for_km(max_day_km)
+
+    return {
+        "route": route,
+        "stop_nights": [n for _, n in stops],
+        "legs": legs,
+        "total_km": sum(km for km, _ in known),
+        "max_day_km": max_day_km,
+        "total_hours": round(sum(hrs for _, hrs in known), 1),
+        "max_day_hours": max((hrs for _, hrs in known), default=None),
+        "unknown_legs": unknown_legs,
+        "fatigue": fatigue,
+    }
+
+
+def evaluate_itineraries(plans, start_city):
+    """
+    Evaluate a whole catalogue with one shared leg cache.
+    Results are aligned with `plans`; treat them as read-only.
+    """
+    leg_cache = {}
+    by_route = {}  # identical destination lists share one (read-only) result
+
+    out = []
+    for p in plans:
+        key = tuple(_stops(p))
+        if key not in by_route:
+            by_route[key] = evaluate_itinerary(p, start_city, leg_cache)
+        out.append(by_route[key])
+    return out
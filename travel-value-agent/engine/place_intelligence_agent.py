@@ -1,24 +1,33 @@
 import os
+import re
 import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from engine.atomic_io import atomic_write_json
+# Road km / hours: the shared store road_distance_agent also reads
+from engine.distance_store import get_store, source_fingerprint
 
 CACHE_DIR = "data/place_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# -------------------------------------------------
-# STATIC ROAD MATRIX (PHASE 1)
-# -------------------------------------------------
-ROAD_MATRIX = {
-    "Delhi": {
-        "Dehradun": (245, 6),
-        "Haridwar": (220, 5.5),
-        "Rishikesh": (240, 6),
-        "Mussoorie": (290, 8),
-        "Nainital": (300, 8.5),
-        "Corbett": (260, 7),
-        "Kausani": (420, 12),
-        "Ranikhet": (380, 11),
-    }
-}
+# Two-tier cache: in-process LRU in front of one JSON file per key.
+# The per-key files live in their own (gitignored) subdirectory so they
+# never mix with the tracked <place>_<month>.json files in CACHE_DIR.
+LOOKUP_CACHE_DIR = os.path.join(CACHE_DIR, "lookups")
+# Bump CACHE_SCHEMA_VERSION when the payload shape changes.
+CACHE_SCHEMA_VERSION = 1
+CACHE_TTL_S = 7 * 24 * 3600
+LRU_MAX_ENTRIES = 1024
+
+# Precomputed month × place × start city table (see PRECOMPUTED TABLE);
+# keys outside it fall back to the LRU → disk cache.
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+START_CITIES = ("Delhi", "Mumbai", "Kolkata", "Chennai", "Hyderabad")
+PLACE_TABLE_FILE = os.path.join(CACHE_DIR, "place_table.json")
 
 # -------------------------------------------------
 # STATIC PLACE INTELLIGENCE
@@ -107,9 +116,9 @@ def _road_fatigue(hours):
 
 
 # -------------------------------------------------
-# MAIN ENTRY (SAFE, COMPLETE)
+# BUILD (uncached)
 # -------------------------------------------------
-def get_place_intelligence(place: str, month: str, start_city: str = "Delhi"):
+def _build_place_intelligence(place: str, month: str, start_city: str):
     data = _default_payload()
 
     # Static enrichment
@@ -122,11 +131,247 @@ def get_place_intelligence(place: str, month: str, start_city: str = "Delhi"):
     data["monsoon_risk"] = _monsoon_risk(month)
 
     # Road info
-    road = ROAD_MATRIX.get(start_city, {}).get(place)
-    if road:
-        km, hrs = road
+    km, hrs = get_store().lookup(start_city, place)
+    if km is not None and hrs is not None:
         data["road_distance_km"] = km
         data["road_time_hr"] = hrs
         data["road_fatigue"] = _road_fatigue(hrs)
 
     return data
+
+
+# -------------------------------------------------
+# CACHE (LRU → disk → build)
+# -------------------------------------------------
+# Entries built from older static tables are treated as misses.
+_DATA_FINGERPRINT = hashlib.sha1(
+    json.dumps(PLACE_PROFILES, sort_keys=True).encode("utf-8") + source_fingerprint()
+).hexdigest()[:12]
+
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+
+CACHE_STATS = {"table_hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "disk_errors": 0}
+
+
+# <place-slug>_<month>_<city-slug>.json, as written by _cache_file()
+_CACHE_FILE_RE = re.compile(r"^[a-z0-9-]+_[^_/\\]+_[a-z0-9-]+\.json$")
+
+
+def _cache_file(key):
+    place, month, start_city = key
+    slug = re.sub(r"[^a-z0-9]+", "-", place.lower()).strip("-") or "place"
+    city = re.sub(r"[^a-z0-9]+", "-", start_city.lower()).strip("-") or "city"
+    return os.path.join(LOOKUP_CACHE_DIR, f"{slug}_{month}_{city}.json")
+
+
+def _fresh(cached_at):
+    return time.time() - cached_at < CACHE_TTL_S
+
+
+def _lru_get(key):
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            return None
+        payload, cached_at = entry
+        if not _fresh(cached_at):
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        CACHE_STATS["memory_hits"] += 1
+        return payload
+
+
+def _lru_put(key, payload, cached_at):
+    with _lru_lock:
+        _lru[key] = (payload, cached_at)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def _disk_get(key):
+    try:
+        with open(_cache_file(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+
+    if (
+        not isinstance(entry, dict)
+        or entry.get("schema_version") != CACHE_SCHEMA_VERSION
+        or entry.get("fingerprint") != _DATA_FINGERPRINT
+        or entry.get("key") != list(key)
+        or not isinstance(entry.get("cached_at"), (int, float))
+        or not _fresh(entry["cached_at"])
+    ):
+        return None, None
+
+    CACHE_STATS["disk_hits"] += 1
+    return entry["payload"], entry["cached_at"]
+
+
+def _disk_put(key, payload, cached_at):
+    try:
+        atomic_write_json(_cache_file(key), {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "fingerprint": _DATA_FINGERPRINT,
+            "key": list(key),
+            "cached_at": cached_at,
+            "payload": payload,
+        })
+    except OSError:
+        # Cache is best-effort; a read-only disk must not break lookups
+        CACHE_STATS["disk_errors"] += 1
+
+
+def get_cache_stats():
+    with _lru_lock:
+        return {
+            **CACHE_STATS,
+            "memory_entries": len(_lru),
+            "table_entries": len(_table) if _table is not None else 0,
+        }
+
+
+def clear_place_cache(disk: bool = False):
+    """
+    Drop the in-process LRU and table (and optionally the per-key cache
+    files; tracked data in CACHE_DIR is never touched).
+    """
+    global _table
+    with _lru_lock:
+        _lru.clear()
+    with _table_lock:
+        _table = None
+    if disk and os.path.isdir(LOOKUP_CACHE_DIR):
+        for name in os.listdir(LOOKUP_CACHE_DIR):
+            if _CACHE_FILE_RE.match(name):
+                os.remove(os.path.join(LOOKUP_CACHE_DIR, name))
+
+
+# -------------------------------------------------
+# PRECOMPUTED TABLE
+# -------------------------------------------------
+# Every (place, month, start_city) over the profiled / routable places, all
+# months and START_CITIES, built once on first use (or loaded from
+# PLACE_TABLE_FILE). Payloads are read-only mappings; callers get copies.
+_table = None
+_table_lock = threading.Lock()
+
+
+def table_keys():
+    places = sorted(set(PLACE_PROFILES) | set(get_store().names))
+    return [(p, m, c) for p in places for m in MONTHS for c in START_CITIES]
+
+
+def build_place_table():
+    return {
+        key: MappingProxyType(_build_place_intelligence(*key))
+        for key in table_keys()
+    }
+
+
+def _write_table(table, path):
+    atomic_write_json(path, {
+        "schema_version": CACHE_SCHEMA_VERSION,
+        "fingerprint": _DATA_FINGERPRINT,
+        "entries": [[*key, dict(payload)] for key, payload in table.items()],
+    })
+
+
+def dump_place_table(path: str = PLACE_TABLE_FILE):
+    """
+    Write the table so other processes can start warm.
+    """
+    table = get_place_table()
+    _write_table(table, path)
+    return len(table)
+
+
+def load_place_table(path: str = PLACE_TABLE_FILE):
+    """
+    Table from disk, or None if missing, unreadable or built from older
+    static data.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if (
+            data.get("schema_version") != CACHE_SCHEMA_VERSION
+            or data.get("fingerprint") != _DATA_FINGERPRINT
+        ):
+            return None
+        return {
+            (place, month, city): MappingProxyType(payload)
+            for place, month, city, payload in data["entries"]
+        }
+    except (OSError, ValueError, TypeError, AttributeError, KeyError):
+        return None
+
+
+def get_place_table():
+    """
+    The shared table: loaded from disk if current, else built (and saved,
+    best-effort) on first use.
+    """
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                table = load_place_table()
+                if table is None:
+                    table = build_place_table()
+                    try:
+                        _write_table(table, PLACE_TABLE_FILE)
+                    except OSError:
+                        CACHE_STATS["disk_errors"] += 1
+                _table = table
+    return _table
+
+
+# -------------------------------------------------
+# MAIN ENTRY (SAFE, COMPLETE)
+# -------------------------------------------------
+def get_place_intelligence(place: str, month: str, start_city: str = "Delhi"):
+    """
+    Payload dict for one place (the caller's own copy). Known keys are a
+    single table lookup; anything else goes through the LRU / disk cache.
+    """
+    key = (place, month, start_city)
+
+    shared = get_place_table().get(key)
+    if shared is not None:
+        CACHE_STATS["table_hits"] += 1
+        return dict(shared)
+
+    payload = _lru_get(key)
+    if payload is None:
+        payload, cached_at = _disk_get(key)
+        if payload is None:
+            CACHE_STATS["misses"] += 1
+            payload, cached_at = _build_place_intelligence(*key), time.time()
+            _disk_put(key, payload, cached_at)
+        _lru_put(key, payload, cached_at)
+
+    # Callers get their own copy; the cached payload stays pristine
+    return dict(payload)
+
+
+def get_place_intelligence_batch(places, month: str, start_city: str = "Delhi"):
+    """
+    Enrich many places at once (e.g. every destination of a result set).
+    Each unique place is resolved once; returns {place: payload} in
+    first-seen order.
+    """
+    return {
+        place: get_place_intelligence(place, month, start_city)
+        for place in dict.fromkeys(places)
+    }
+
+
+if __name__ == "__main__":
+    # Prebuild the table so app workers start warm
+    n = dump_place_table()
+    print(f"✅ {n} place payloads → {PLACE_TABLE_FILE}")
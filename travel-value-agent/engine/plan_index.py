@@ -0,0 +1,98 @@
+# engine/plan_index.py
+# In-memory query engine over validated plans
+#
+# Plans are converted ONCE to typed Plan records (the data contract stores
+# strings). Nights / discounted price are kept as sorted indexes (bisect
+# for ranges) and destinations as an inverted index (set intersection).
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from schema.output_schema import plans_from_dicts, split_destination
+
+
+def place_name(destination: str) -> str:
+    """
+    "Dehradun (1N)" → "Dehradun"
+    """
+    return split_destination(destination)[0]
+
+
+class _SortedIndex:
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [k for k, _ in pairs]
+        self.ids = [i for _, i in pairs]
+
+    def range(self, lo=None, hi=None):
+        start = 0 if lo is None else bisect_left(self.keys, lo)
+        end = len(self.keys) if hi is None else bisect_right(self.keys, hi)
+        return set(self.ids[start:end])
+
+
+class PlanIndex:
+    """
+    index = PlanIndex(plans)
+    index.query(nights_range=(3, 4), max_price=30000, destinations=["Mussoorie"])
+
+    Results keep the original plan order. Only the typed Plan records are
+    held: query_records() returns them, query() rebuilds contract dicts.
+    """
+
+    def __init__(self, plans):
+        self.records = plans_from_dicts(plans)
+
+        # Unparseable numbers simply never match a range
+        self._by_nights = _SortedIndex(
+            (r.nights, i) for i, r in enumerate(self.records) if r.nights is not None
+        )
+        self._by_price = _SortedIndex(
+            (r.price_discounted, i) for i, r in enumerate(self.records)
+            if r.price_discounted is not None
+        )
+
+        self._by_place = defaultdict(set)
+        for i, r in enumerate(self.records):
+            for place in r.places:
+                self._by_place[place].add(i)
+
+    def __len__(self):
+        return len(self.records)
+
+    def places(self):
+        return sorted(self._by_place)
+
+    def query(self, nights_range=None, max_price=None, destinations=None):
+        """
+        nights_range: (min, max) inclusive, or None
+        max_price:    upper bound on discounted price; None/0 = no limit
+        destinations: plans must visit ALL of these places
+        """
+        return [r.to_dict() for r in self.query_records(nights_range, max_price, destinations)]
+
+    def query_records(self, nights_range=None, max_price=None, destinations=None):
+        ids = self._match(nights_range, max_price, destinations)
+        if ids is None:
+            return list(self.records)
+        return [self.records[i] for i in ids]
+
+    def _match(self, nights_range, max_price, destinations):
+        candidates = None
+
+        def narrow(ids):
+            nonlocal candidates
+            candidates = ids if candidates is None else candidates & ids
+
+        if nights_range is not None:
+            narrow(self._by_nights.range(nights_range[0], nights_range[1]))
+
+        if max_price:
+            narrow(self._by_price.range(None, max_price))
+
+        for place in destinations or ():
+            narrow(self._by_place.get(place, set()))
+
+        if candidates is None:
+            return None
+        return sorted(candidates)
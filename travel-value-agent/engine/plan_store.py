@@ -0,0 +1,326 @@
+# engine/plan_store.py
+# Optional SQLite store for validated plans (beside data/valid_plans.json)
+#
+# valid_plans.json stays the frozen data contract; this store holds the
+# same plans with typed, indexed columns so filters run as SQL instead of
+# parsing the whole catalogue. Contract strings are kept verbatim and
+# duplicate plans are stored like any other row, so export_json()
+# reproduces the JSON exactly (duplicates included).
+#
+#   python -m engine.plan_store export [--db data/valid_plans.sqlite] [--output data/valid_plans.json]
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+
+from engine.atomic_io import atomic_write_json
+from engine.plan_index import place_name
+from schema.output_schema import CONTRACT_KEYS, plans_from_dicts
+
+PLAN_DB_FILE = "data/valid_plans.sqlite"
+PLANS_FILE = "data/valid_plans.json"
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    id                   INTEGER PRIMARY KEY,
+    package_name         TEXT    NOT NULL,
+    nights               INTEGER,
+    days                 INTEGER,
+    price_original       INTEGER,
+    price_discounted     INTEGER,
+    nights_raw           TEXT    NOT NULL,
+    days_raw             TEXT    NOT NULL,
+    price_original_raw   TEXT,
+    price_discounted_raw TEXT    NOT NULL,
+    tour_type            TEXT,
+    facilities           TEXT    NOT NULL,  -- JSON list
+    discount             TEXT,
+    copy                 INTEGER NOT NULL,  -- n-th plan with this key (0 = first)
+    position             INTEGER NOT NULL,  -- catalogue order
+    row_hash             TEXT    NOT NULL,
+    UNIQUE (package_name, nights_raw, price_discounted_raw, copy)
+);
+
+CREATE TABLE IF NOT EXISTS plan_destinations (
+    plan_id     INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    destination TEXT    NOT NULL,  -- as written, e.g. "Dehradun (1N)"
+    place       TEXT    NOT NULL,
+    PRIMARY KEY (plan_id, seq)
+);
+
+CREATE INDEX IF NOT EXISTS idx_plans_nights   ON plans(nights);
+CREATE INDEX IF NOT EXISTS idx_plans_price    ON plans(price_discounted);
+CREATE INDEX IF NOT EXISTS idx_plans_position ON plans(position);
+CREATE INDEX IF NOT EXISTS idx_dest_place     ON plan_destinations(place, plan_id);
+"""
+
+_PLAN_COLUMNS = (
+    "package_name, nights_raw, days_raw, tour_type, facilities, "
+    "price_original_raw, price_discounted_raw, discount, id"
+)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_valid_plan(p):
+    # Shared by sync_plans() and main.py's JSON loader
+    return (
+        isinstance(p, dict)
+        and p.get("Package Name")
+        and p.get("Nights")
+        and p.get("Days")
+        and p.get("Price Discounted")
+    )
+
+
+def plan_key(plan):
+    return (plan["Package Name"], plan["Nights"], plan["Price Discounted"])
+
+
+def _row_hash(plan):
+    canon = json.dumps([plan.get(k) for k in CONTRACT_KEYS], ensure_ascii=False)
+    return hashlib.sha1(canon.encode("utf-8")).hexdigest()
+
+
+def connect(path=PLAN_DB_FILE):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version != SCHEMA_VERSION:
+        # Derived from valid_plans.json: rebuilt on the next sync, not migrated
+        conn.executescript("DROP TABLE IF EXISTS plan_destinations; DROP TABLE IF EXISTS plans;")
+    conn.executescript(_SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+# -------------------------------------------------
+# WRITE (incremental upsert)
+# -------------------------------------------------
+def sync_plans(plans, path=PLAN_DB_FILE):
+    """
+    Make the store hold exactly `plans` (in that order), in one transaction.
+    Unchanged rows are not touched (at most re-positioned), changed ones
+    are upserted and plans no longer present are deleted. Duplicate keys
+    (name, nights, discounted price) are all kept, as in the JSON; the
+    n-th copy of a key is matched to the n-th stored copy. Returns counts.
+    """
+    wanted = {}
+    copies = {}
+    for p in plans:
+        if is_valid_plan(p):
+            key = plan_key(p)
+            copies[key] = copies.get(key, -1) + 1
+            wanted[(*key, copies[key])] = p
+
+    summary = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    with contextlib.closing(connect(path)) as conn, conn:
+        existing = {
+            (name, nights, price, copy): (plan_id, row_hash, position)
+            for plan_id, name, nights, price, copy, row_hash, position in conn.execute(
+                "SELECT id, package_name, nights_raw, price_discounted_raw, copy, row_hash, position FROM plans"
+            )
+        }
+
+        moved = []
+        for position, (key, p) in enumerate(wanted.items()):
+            row_hash = _row_hash(p)
+            old = existing.get(key)
+            if old and old[1] == row_hash:
+                if old[2] != position:
+                    moved.append((position, old[0]))
+                summary["unchanged"] += 1
+                continue
+
+            conn.execute(
+                """
+                INSERT INTO plans (
+                    package_name, nights, days, price_original, price_discounted,
+                    nights_raw, days_raw, price_original_raw, price_discounted_raw,
+                    tour_type, facilities, discount, copy, position, row_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (package_name, nights_raw, price_discounted_raw, copy) DO UPDATE SET
+                    days = excluded.days,
+                    price_original = excluded.price_original,
+                    days_raw = excluded.days_raw,
+                    price_original_raw = excluded.price_original_raw,
+                    tour_type = excluded.tour_type,
+                    facilities = excluded.facilities,
+                    discount = excluded.discount,
+                    position = excluded.position,
+                    row_hash = excluded.row_hash
+                """,
+                (
+                    p["Package Name"], _to_int(p["Nights"]), _to_int(p["Days"]),
+                    _to_int(p.get("Price Original")), _to_int(p["Price Discounted"]),
+                    p["Nights"], p["Days"], p.get("Price Original"), p["Price Discounted"],
+                    p.get("Tour Type"), json.dumps(p.get("Facilities", []), ensure_ascii=False),
+                    p.get("Discount"), key[3], position, row_hash,
+                ),
+            )
+            (plan_id,) = conn.execute(
+                "SELECT id FROM plans WHERE package_name = ? AND nights_raw = ? "
+                "AND price_discounted_raw = ? AND copy = ?",
+                key,
+            ).fetchone()
+
+            conn.execute("DELETE FROM plan_destinations WHERE plan_id = ?", (plan_id,))
+            conn.executemany(
+                "INSERT INTO plan_destinations (plan_id, seq, destination, place) VALUES (?, ?, ?, ?)",
+                [(plan_id, seq, d, place_name(d)) for seq, d in enumerate(p.get("Destinations", []))],
+            )
+            summary["updated" if old else "inserted"] += 1
+
+        conn.executemany("UPDATE plans SET position = ? WHERE id = ?", moved)
+
+        stale = [old[0] for key, old in existing.items() if key not in wanted]
+        conn.executemany("DELETE FROM plans WHERE id = ?", [(i,) for i in stale])
+        summary["deleted"] = len(stale)
+
+    return summary
+
+
+# -------------------------------------------------
+# READ
+# -------------------------------------------------
+class PlanStore:
+    """
+    store = PlanStore("data/valid_plans.sqlite")
+    store.query(nights_range=(3, 4), max_price=30000, destinations=["Mussoorie"])
+
+    Same contract and semantics as PlanIndex.query(); results are plan
+    dicts in catalogue order. A short-lived read-only connection is opened
+    per call, so one store can be shared across Streamlit sessions.
+    """
+
+    def __init__(self, path=PLAN_DB_FILE):
+        self.path = path
+
+    def _connect(self):
+        uri = "file:" + os.path.abspath(self.path) + "?mode=ro"
+        return contextlib.closing(sqlite3.connect(uri, uri=True))
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+
+    def places(self):
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute(
+                "SELECT DISTINCT place FROM plan_destinations ORDER BY place"
+            )]
+
+    def query(self, nights_range=None, max_price=None, destinations=None):
+        """
+        nights_range: (min, max) inclusive, or None
+        max_price:    upper bound on discounted price; None/0 = no limit
+        destinations: plans must visit ALL of these places
+        """
+        where, args = [], []
+        if nights_range is not None:
+            where.append("nights BETWEEN ? AND ?")
+            args.extend(nights_range)
+        if max_price:
+            where.append("price_discounted <= ?")
+            args.append(max_price)
+        for place in destinations or ():
+            where.append("id IN (SELECT plan_id FROM plan_destinations WHERE place = ?)")
+            args.append(place)
+
+        sql = f"SELECT {_PLAN_COLUMNS} FROM plans"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY position"
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, args).fetchall()
+            return self._to_plans(conn, rows)
+
+    def query_records(self, nights_range=None, max_price=None, destinations=None):
+        return plans_from_dicts(self.query(nights_range, max_price, destinations))
+
+    def all(self):
+        return self.query()
+
+    @staticmethod
+    def _to_plans(conn, rows):
+        if not rows:
+            return []
+
+        dests = {}
+        ids = [r[-1] for r in rows]
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 900):
+            chunk = ids[start:start + 900]
+            marks = ",".join("?" * len(chunk))
+            for plan_id, destination in conn.execute(
+                f"SELECT plan_id, destination FROM plan_destinations "
+                f"WHERE plan_id IN ({marks}) ORDER BY plan_id, seq",
+                chunk,
+            ):
+                dests.setdefault(plan_id, []).append(destination)
+
+        plans = []
+        for name, nights, days, tour_type, facilities, p_orig, p_disc, discount, plan_id in rows:
+            plans.append({
+                "Package Name": name,
+                "Nights": nights,
+                "Days": days,
+                "Destinations": dests.get(plan_id, []),
+                "Tour Type": tour_type,
+                "Facilities": json.loads(facilities),
+                "Price Original": p_orig,
+                "Price Discounted": p_disc,
+                "Discount": discount,
+            })
+        return plans
+
+
+def export_json(db_path=PLAN_DB_FILE, output_file=PLANS_FILE):
+    """
+    Write the store back out in the frozen valid_plans.json format.
+    """
+    plans = PlanStore(db_path).all()
+    atomic_write_json(output_file, plans)
+    return len(plans)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite plan store utilities.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="write the store as valid_plans.json")
+    p.add_argument("--db", default=PLAN_DB_FILE)
+    p.add_argument("--output", default=PLANS_FILE)
+
+    p = sub.add_parser("import", help="load a valid_plans.json into the store")
+    p.add_argument("--db", default=PLAN_DB_FILE)
+    p.add_argument("--input", default=PLANS_FILE)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        n = export_json(args.db, args.output)
+        print(f"✅ Exported {n} plans → {args.output}")
+    elif args.command == "import":
+        with open(args.input, "r", encoding="utf-8") as f:
+            summary = sync_plans(json.load(f), args.db)
+        print(f"✅ {args.db}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
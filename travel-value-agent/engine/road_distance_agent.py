@@ -28,9 +28,107 @@ CITY_DISTANCES_KM = {
 }
 
 
+# Hub / connector roads (undirected, approximate km). Together with the
+# pairs above they form a road graph, so any two connected places get a
+# distance: other start cities, and legs between itinerary destinations.
+HUB_EDGES_KM = {
+    # Metro → Delhi corridor
+    ("Mumbai", "Delhi"): 1420,
+    ("Kolkata", "Delhi"): 1530,
+    ("Chennai", "Delhi"): 2200,
+    ("Hyderabad", "Delhi"): 1570,
+
+    # Garhwal gateway
+    ("Delhi", "Dehradun"): 245,
+    ("Dehradun", "Mussoorie"): 35,
+    ("Dehradun", "Haridwar"): 55,
+    ("Dehradun", "Rishikesh"): 45,
+    ("Haridwar", "Rishikesh"): 25,
+
+    # Char Dham roads
+    ("Dehradun", "Barkot"): 130,
+    ("Mussoorie", "Barkot"): 90,
+    ("Barkot", "Yamunotri"): 50,
+    ("Barkot", "Uttarkashi"): 82,
+    ("Rishikesh", "Uttarkashi"): 170,
+    ("Uttarkashi", "Gangotri"): 100,
+    ("Rishikesh", "Rudraprayag"): 140,
+    ("Rudraprayag", "Guptkashi"): 45,
+    ("Guptkashi", "Sersi"): 12,
+    ("Sersi", "Kedarnath"): 35,
+    ("Rudraprayag", "Joshimath"): 105,
+    ("Joshimath", "Badrinath"): 45,
+    ("Uttarkashi", "Guptkashi"): 210,
+
+    # Kumaon
+    ("Delhi", "Kathgodam"): 280,
+    ("Kathgodam", "Nainital"): 35,
+    ("Nainital", "Ranikhet"): 60,
+    ("Ranikhet", "Kausani"): 65,
+    ("Nainital", "Corbett"): 65,
+    ("Haridwar", "Corbett"): 190,
+}
+
+
+# Measured driving times (either direction) as (km driven, hours), from
+# the original place-intelligence road table. The store keeps each road's
+# measured average speed and applies it to the km it actually uses, so a
+# row whose km was since corrected (Nainital, Kausani, Ranikhet) is
+# rescaled rather than paired with hours for a different distance. Pairs
+# not listed are estimated from km in engine.distance_store.
+ROAD_TIME_HR = {
+    ("Delhi", "Dehradun"): (245, 6),
+    ("Delhi", "Haridwar"): (220, 5.5),
+    ("Delhi", "Rishikesh"): (240, 6),
+    ("Delhi", "Mussoorie"): (290, 8),
+    ("Delhi", "Nainital"): (300, 8.5),
+    ("Delhi", "Corbett"): (260, 7),
+    ("Delhi", "Kausani"): (420, 12),
+    ("Delhi", "Ranikhet"): (380, 11),
+}
+
+
+# -------------------------------------------------
+# LOOKUPS (compiled store, loaded on first use)
+# -------------------------------------------------
+def _store():
+    from engine.distance_store import get_store
+    return get_store()
+
+
+def known_places():
+    return list(_store().names)
+
+
 def get_road_distance(start_city: str, destination: str):
     """
-    Returns distance in km (int) or None if unknown.
+    Returns distance in km (int) or None if unknown; the same in either
+    direction. Listed pairs keep their exact value; anything else is the
+    shortest path over the road graph.
+    """
+    return _store().km_between(start_city, destination)
+
+
+def get_road_time(start_city: str, destination: str):
+    """
+    Driving hours or None if unknown; the same in either direction
+    (measured speed where listed, else estimated from km).
+    """
+    return _store().hours_between(start_city, destination)
+
+
+def get_road_distance_matrix(places):
+    """
+    km between every pair of `places` (row → column), None if unknown.
+    """
+    store = _store()
+    return [[store.km_between(a, b) for b in places] for a in places]
+
+
+def get_leg_distances(route):
+    """
+    km for each consecutive leg of a route, e.g.
+    ["Delhi", "Dehradun", "Sersi", "Badrinath"] → [245, 242, 207]
     """
-    key = (start_city, destination)
-    return CITY_DISTANCES_KM.get(key)
+    store = _store()
+    return [store.km_between(a, b) for a, b in zip(route, route[1:])]
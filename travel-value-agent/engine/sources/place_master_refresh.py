@@ -0,0 +1,154 @@
+# engine/sources/place_master_refresh.py
+# Bulk refresh of data/place_master.json from Wikipedia infoboxes
+#
+# Every place named in valid_plans.json destinations is fetched
+# concurrently (bounded), and each result is merged into the master
+# and written atomically as soon as it arrives.
+#
+#   python -m engine.sources.place_master_refresh [--concurrency 8] [--rate 5] [Place ...]
+#
+# Throughput is bounded by the fetcher's token bucket as well as by
+# --concurrency: beyond the burst, N places take about N / rate seconds.
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from engine.atomic_io import atomic_write_json
+from engine.sources.wikipedia_source import RATE_BURST, RATE_PER_S, WikipediaFetcher
+
+PLACE_MASTER_FILE = "data/place_master.json"
+PLANS_FILE = "data/valid_plans.json"
+MAX_CONCURRENCY = 8
+
+
+def places_from_plans(path=PLANS_FILE):
+    """
+    Unique place names from plan destinations, first-seen order.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        plans = json.load(f)
+
+    places = {}
+    for p in plans:
+        for dest in p.get("Destinations", []):
+            place = dest.split("(")[0].strip()
+            if place:
+                places[place] = None
+    return list(places)
+
+
+def _load_master(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge_facts(entry, facts):
+    """
+    Only overwrite hand-maintained values with facts Wikipedia actually
+    had; keys we don't fetch (e.g. family_note) are kept.
+    """
+    merged = dict(entry)
+    if facts.get("altitude_m") is not None:
+        merged["altitude_m"] = facts["altitude_m"]
+    if facts.get("languages"):
+        merged["languages"] = facts["languages"]
+    if facts.get("population_context", "Unknown") != "Unknown":
+        merged["population_density"] = facts["population_context"]
+    merged["fetched_at"] = facts.get("fetched_at")
+    return merged
+
+
+def refresh_place_master(
+    places=None,
+    master_file=PLACE_MASTER_FILE,
+    concurrency=MAX_CONCURRENCY,
+    fetcher=None,
+    rate_per_s=RATE_PER_S,
+    burst=None,
+):
+    """
+    rate_per_s / burst size the token bucket of the fetcher created here
+    (burst defaults to max(RATE_BURST, concurrency) so every worker can
+    start at once); both are ignored when a `fetcher` is passed in.
+    """
+    if places is None:
+        places = places_from_plans()
+
+    concurrency = max(1, concurrency)
+    owns_fetcher = fetcher is None
+    if owns_fetcher:
+        fetcher = WikipediaFetcher(
+            rate_per_s=rate_per_s,
+            burst=burst or max(RATE_BURST, concurrency),
+            pool_size=concurrency,
+        )
+
+    try:
+        return _refresh(places, master_file, concurrency, fetcher)
+    finally:
+        if owns_fetcher:
+            fetcher.close()
+
+
+def _refresh(places, master_file, concurrency, fetcher):
+    master = _load_master(master_file)
+    summary = {"updated": [], "missing": [], "failed": {}}
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(fetcher.fetch, place): place for place in places}
+
+        # Results are merged on this thread only, one atomic write each
+        for fut in as_completed(futures):
+            place = futures[fut]
+            try:
+                facts = fut.result()
+            except Exception as e:
+                summary["failed"][place] = str(e)
+                continue
+
+            if facts is None:
+                summary["missing"].append(place)
+                continue
+
+            master[place] = merge_facts(master.get(place, {}), facts)
+            atomic_write_json(master_file, master, indent=4)
+            summary["updated"].append(place)
+
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh place_master.json from Wikipedia.")
+    parser.add_argument("places", nargs="*", help="default: every destination in valid_plans.json")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=RATE_PER_S,
+                        help="sustained requests per second (token bucket)")
+    parser.add_argument("--burst", type=int,
+                        help=f"requests allowed back to back (default: max({RATE_BURST}, concurrency))")
+    parser.add_argument("--master", default=PLACE_MASTER_FILE)
+    args = parser.parse_args(argv)
+
+    summary = refresh_place_master(
+        places=args.places or None,
+        master_file=args.master,
+        concurrency=args.concurrency,
+        rate_per_s=args.rate,
+        burst=args.burst,
+    )
+
+    print(f"✅ Updated {len(summary['updated'])} place(s) in {summary['seconds']}s → {args.master}")
+    if summary["missing"]:
+        print("⚠️ No article:", ", ".join(summary["missing"]))
+    for place, err in summary["failed"].items():
+        print(f"❌ {place}: {err}")
+
+
+if __name__ == "__main__":
+    main()
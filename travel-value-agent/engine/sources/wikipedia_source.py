@@ -1,36 +1,93 @@
 # engine/sources/wikipedia_source.py
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+import json
+import os
 import re
+import threading
+import time
 from datetime import datetime, timedelta
 
+from engine.atomic_io import atomic_write_json
+
 
 WIKI_BASE = "https://en.wikipedia.org/wiki/"
 
+# -------------------------------------------------
+# FETCHER DEFAULTS
+# -------------------------------------------------
+CACHE_DIR = "data/wiki_cache"
+CACHE_TTL = timedelta(days=30)
+USER_AGENT = "TravelValueAgent/1.0 (place facts refresher)"
 
-def fetch_place_facts(place_name: str):
+RATE_PER_S = 5.0       # sustained requests per second
+RATE_BURST = 5         # bucket capacity
+MAX_RETRIES = 3
+BACKOFF_S = 0.5        # 0.5s, 1s, 2s ...
+MAX_RETRY_AFTER_S = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Bump CACHE_VERSION when parsing changes, so facts cached by an older
+# parser are downloaded again instead of being revalidated (304) as-is.
+CACHE_VERSION = 2
+
+
+# -------------------------------------------------
+# PARSING
+# -------------------------------------------------
+try:
+    import lxml  # noqa: F401 — optional, much faster than html.parser
+    FAST_PARSER = "lxml"
+except ImportError:
+    FAST_PARSER = "html.parser"
+
+# Attribute values may contain ">" (e.g. Parsoid's data-mw JSON)
+_TABLE_OPEN_RE = re.compile(r"""<table\b((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.I)
+_TABLE_TAG_RE = re.compile(r"<table\b|</table\s*>", re.I)
+_CLASS_ATTR_RE = re.compile(
+    r"""(?:^|\s)class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I
+)
+
+
+def _slice_infobox(html: str):
     """
-    Fetch altitude, languages, and population context dynamically from Wikipedia.
+    Raw markup of the first <table class="... infobox ...">, found with
+    a regex scan instead of building a tree of the whole article.
+    None if there is no such table or it is never closed.
     """
-    url = WIKI_BASE + place_name.replace(" ", "_")
-    resp = requests.get(url, timeout=15)
+    for m in _TABLE_OPEN_RE.finditer(html):
+        cls = _CLASS_ATTR_RE.search(m.group(1))
+        if not cls or "infobox" not in next(g for g in cls.groups() if g is not None).split():
+            continue
 
-    if resp.status_code != 200:
+        depth = 0
+        for tag in _TABLE_TAG_RE.finditer(html, m.start()):
+            depth += -1 if tag.group(0).startswith("</") else 1
+            if depth == 0:
+                return html[m.start():tag.end()]
         return None
+    return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    info = {
+
+def _has_infobox_class(value):
+    # SoupStrainer sees the raw attribute ("infobox ib-settlement vcard"),
+    # so class_="infobox" alone would only match a bare class="infobox"
+    if not value:
+        return False
+    return "infobox" in (value.split() if isinstance(value, str) else value)
+
+
+def _empty_facts():
+    return {
         "altitude_m": None,
         "languages": [],
         "population_context": "Unknown",
         "fetched_at": datetime.utcnow().isoformat()
     }
 
-    infobox = soup.find("table", class_="infobox")
-    if not infobox:
-        return info
 
+def _facts_from_infobox(infobox, info):
     for row in infobox.find_all("tr"):
         header = row.find("th")
         value = row.find("td")
@@ -43,9 +100,10 @@ def fetch_place_facts(place_name: str):
 
         # Altitude
         if "elevation" in h or "altitude" in h:
-            m = re.search(r"(\d+)\s*m", v)
+            # Thousands separators: "2,084 m" is 2084, not 84
+            m = re.search(r"(\d[\d,]*)\s*m", v)
             if m:
-                info["altitude_m"] = int(m.group(1))
+                info["altitude_m"] = int(m.group(1).replace(",", ""))
 
         # Languages
         if "languages" in h:
@@ -65,3 +123,261 @@ def fetch_place_facts(place_name: str):
                     info["population_context"] = "Low"
 
     return info
+
+
+def find_infobox(html: str, fast: bool = True):
+    """
+    fast=True : parse only the sliced infobox (SoupStrainer fallback)
+    fast=False: full html.parser tree of the article (original path)
+    """
+    if not fast:
+        return BeautifulSoup(html, "html.parser").find("table", class_="infobox")
+
+    fragment = _slice_infobox(html)
+    if fragment is not None:
+        infobox = BeautifulSoup(fragment, FAST_PARSER).find("table", class_="infobox")
+        if infobox is not None:
+            return infobox
+
+    only_infobox = SoupStrainer("table", class_=_has_infobox_class)
+    return BeautifulSoup(html, FAST_PARSER, parse_only=only_infobox).find("table", class_="infobox")
+
+
+def parse_place_facts(html: str, fast: bool = True):
+    """
+    Altitude, languages and population context from an article's infobox.
+    """
+    info = _empty_facts()
+
+    infobox = find_infobox(html, fast=fast)
+    if not infobox:
+        return info
+
+    return _facts_from_infobox(infobox, info)
+
+
+# -------------------------------------------------
+# RATE LIMITING
+# -------------------------------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens/s, at most `capacity` banked.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# -------------------------------------------------
+# FETCHER
+# -------------------------------------------------
+class WikipediaFetcher:
+    """
+    Pooled keep-alive session + persistent per-place response cache.
+
+    - Cached facts younger than `ttl` (by their `fetched_at`) are served
+      without any request.
+    - Older entries are revalidated with If-None-Match / If-Modified-Since;
+      a 304 just refreshes `fetched_at`.
+    - Requests pass a token bucket and are retried with exponential
+      backoff on connection errors, 429 and 5xx.
+    """
+
+    def __init__(
+        self,
+        base_url: str = WIKI_BASE,
+        cache_dir: str = CACHE_DIR,
+        ttl: timedelta = CACHE_TTL,
+        rate_per_s: float = RATE_PER_S,
+        burst: int = RATE_BURST,
+        max_retries: int = MAX_RETRIES,
+        backoff_s: float = BACKOFF_S,
+        timeout: float = 15,
+        pool_size: int = 10,
+    ):
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate_per_s, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+        self.stats = {"cache_hits": 0, "not_modified": 0, "downloads": 0, "retries": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # -------------------------
+    # Cache
+    # -------------------------
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _cache_path(self, place_name):
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", place_name).strip("_") or "place"
+        return os.path.join(self.cache_dir, f"{slug}.json")
+
+    def _load_cached(self, place_name):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(place_name), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(entry, dict)
+            or entry.get("version") != CACHE_VERSION
+            or entry.get("place") != place_name
+            or "facts" not in entry
+        ):
+            return None
+        return entry
+
+    def _save_cached(self, place_name, facts, etag=None, last_modified=None):
+        if not self.cache_dir:
+            return
+        atomic_write_json(self._cache_path(place_name), {
+            "version": CACHE_VERSION,
+            "place": place_name,
+            "etag": etag,
+            "last_modified": last_modified,
+            "facts": facts,
+        })
+
+    def _fresh(self, facts):
+        try:
+            fetched = datetime.fromisoformat(facts["fetched_at"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return datetime.utcnow() - fetched < self.ttl
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    def _get(self, url, headers):
+        """
+        GET with rate limiting and bounded retries. Raises the last
+        connection error once retries are exhausted.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_s * (2 ** attempt)
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return resp
+                delay = self.backoff_s * (2 ** attempt)
+                retry_after = resp.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, min(int(retry_after), MAX_RETRY_AFTER_S))
+
+            self._count("retries")
+            time.sleep(delay)
+
+    def fetch(self, place_name: str):
+        """
+        Same result shape as fetch_place_facts(); None if the article
+        does not exist (non-200).
+        """
+        cached = self._load_cached(place_name)
+        if cached and self._fresh(cached["facts"]):
+            self._count("cache_hits")
+            return cached["facts"]
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        url = self.base_url + place_name.replace(" ", "_")
+        try:
+            resp = self._get(url, headers)
+        except (requests.ConnectionError, requests.Timeout):
+            self._count("errors")
+            if cached:
+                return cached["facts"]  # stale beats nothing
+            raise
+
+        if resp.status_code == 304 and cached:
+            self._count("not_modified")
+            facts = dict(cached["facts"], fetched_at=datetime.utcnow().isoformat())
+            self._save_cached(
+                place_name, facts,
+                etag=resp.headers.get("ETag", cached.get("etag")),
+                last_modified=resp.headers.get("Last-Modified", cached.get("last_modified")),
+            )
+            return facts
+
+        if resp.status_code != 200:
+            self._count("errors")
+            return None
+
+        self._count("downloads")
+        facts = parse_place_facts(resp.text)
+        self._save_cached(
+            place_name, facts,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return facts
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_fetcher():
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = WikipediaFetcher()
+        return _default_fetcher
+
+
+def fetch_place_facts(place_name: str):
+    """
+    Fetch altitude, languages, and population context dynamically from Wikipedia.
+    Served through the shared, cached and rate-limited WikipediaFetcher.
+    """
+    return get_default_fetcher().fetch(place_name)
@@ -1,9 +1,20 @@
 import streamlit as st
+import heapq
 import json
+import math
 import os
 
-from engine.place_intelligence_agent import get_place_intelligence
-from engine.road_distance_agent import get_road_distance
+from engine.place_intelligence_agent import get_place_intelligence_batch
+from engine.plan_index import PlanIndex
+from engine.plan_store import PlanStore, is_valid_plan
+from engine.itinerary_agent import evaluate_itineraries
+from engine.family_scoring import (
+    senior_friendliness,
+    kid_friendliness,
+    family_score,
+    score_catalogue,
+    FATIGUE_LABELS,
+)
 
 st.set_page_config(
     page_title="Travel Value Agent",
@@ -15,66 +26,49 @@ st.title("🌄 Travel Value Agent")
 st.caption("Family-Friendly Travel Value Explorer")
 
 DATA_FILE = "data/valid_plans.json"
-
-
-def load_plans():
-    if not os.path.exists(DATA_FILE):
-        st.error("valid_plans.json not found. Run customized_plan_extractor.py first.")
-        return []
-
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
+# Written by `customized_plan_extractor.py --sqlite`; used instead of the
+# JSON when present, so filtering runs as indexed SQL.
+PLAN_DB_FILE = "data/valid_plans.sqlite"
+
+
+# Streamlit reruns this whole script on every widget change. The plan
+# index is cached per (path, mtime, size), so the JSON is only re-read
+# after the extractor has actually replaced the file. Only the index's
+# typed records are kept; the parsed dicts are dropped once indexed.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_plan_index_cached(path, mtime_ns, size):
+    with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    clean = []
-    for p in data:
-        if (
-            isinstance(p, dict)
-            and p.get("Package Name")
-            and p.get("Nights")
-            and p.get("Days")
-            and p.get("Price Discounted")
-        ):
-            clean.append(p)
-    return clean
-
-
-def travel_fatigue_by_road(start_city, first_place):
-    km = get_road_distance(start_city, first_place)
-    if km is None:
-        return "Unknown", None
-
-    if km < 200:
-        return "Low", km
-    elif km <= 400:
-        return "Medium", km
-    else:
-        return "High", km
-
+    # Same validity gate the SQLite store applies on sync
+    return PlanIndex(p for p in data if is_valid_plan(p))
 
-def senior_friendliness(fatigue, nights):
-    score = 5
-    if fatigue == "High":
-        score -= 2
-    if nights <= 3:
-        score -= 1
-    return max(score, 1)
 
+# Query results are typed Plan records (numbers and destinations parsed
+# once); they are converted back to contract dicts only for rendering.
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _query_records_cached(path, mtime_ns, size, nights_range, max_price):
+    if path == PLAN_DB_FILE:
+        return PlanStore(path).query_records(nights_range=nights_range, max_price=max_price)
+    index = _load_plan_index_cached(path, mtime_ns, size)
+    return index.query_records(nights_range=nights_range, max_price=max_price)
 
-def kid_friendliness(plan):
-    score = 5
-    if int(plan["Nights"]) <= 3:
-        score -= 1
-    if len(plan.get("Destinations", [])) >= 4:
-        score -= 2
-    if plan.get("Tour Type") == "Group Tour":
-        score -= 1
-    return max(score, 1)
 
+def plan_source():
+    """
+    (path, mtime_ns, size) of the catalogue to read — the SQLite store if
+    present and not older than valid_plans.json, else the JSON — or None.
+    """
+    stats = {path: os.stat(path) for path in (PLAN_DB_FILE, DATA_FILE) if os.path.exists(path)}
+    if not stats:
+        return None
 
-def family_score(plan):
-    score = 50
-    score += kid_friendliness(plan) * 5
-    return score
+    path = PLAN_DB_FILE
+    if path not in stats or (
+        DATA_FILE in stats and stats[PLAN_DB_FILE].st_mtime_ns < stats[DATA_FILE].st_mtime_ns
+    ):
+        path = DATA_FILE
+    return path, stats[path].st_mtime_ns, stats[path].st_size
 
 
 st.subheader("👨‍👩‍👧 Traveller Details")
@@ -121,57 +115,164 @@ max_price = {
 }[budget_label]
 
 
-def filter_plans(plans):
-    out = []
-    for p in plans:
-        nights = int(p["Nights"])
-        price = int(p["Price Discounted"])
-        if not (nights_range[0] <= nights <= nights_range[1]):
-            continue
-        if max_price and price > max_price:
-            continue
-        out.append(p)
-    return out
-
-
-if st.button("🔍 Find Best Plans"):
-    plans = load_plans()
-    plans = filter_plans(plans)
-
-    st.success(f"{len(plans)} plans found")
-
-    for i, plan in enumerate(plans, 1):
-        st.markdown(f"## {i}. {plan['Package Name']}")
-        st.write(f"🛏 Nights: {plan['Nights']} | 📅 Days: {plan['Days']}")
-        st.write(f"💰 Price: ₹{plan['Price Discounted']}")
-        st.write(f"🚌 Tour Type: {plan.get('Tour Type', 'N/A')}")
-        st.write(f"👶 Kid Score: {kid_friendliness(plan)}/5")
-
-        first_place = plan["Destinations"][0].split("(")[0].strip()
-        fatigue, km = travel_fatigue_by_road(start_city, first_place)
-
-        st.write(f"🚗 Road Travel: {start_city} → {first_place}")
-        st.write(f"🧠 Road Fatigue: {fatigue}" + (f" (~{km} km)" if km else ""))
-
-        st.write(f"🧓 Senior Friendliness: {senior_friendliness(fatigue, int(plan['Nights']))}/5")
-        st.write(f"🏆 Family Score: {family_score(plan)}")
+def query_records():
+    source = plan_source()
+    if source is None:
+        st.error("valid_plans.json not found. Run customized_plan_extractor.py first.")
+        return []
+    return _query_records_cached(*source, nights_range, max_price)
+
+
+# -------------------------------------------------
+# RANKED MODE (top-K by family score, paginated)
+# -------------------------------------------------
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _rank_plans_cached(path, mtime_ns, size, nights_range, max_price, start_city, k):
+    """
+    Filter via the index / store, score the whole result set in one batched
+    pass, then heap-select the top K (ties keep catalogue order).
+    Returns (total_matches, [(plan, scores), ...]).
+    """
+    records = _query_records_cached(path, mtime_ns, size, nights_range, max_price)
+    if not records:
+        return 0, []
+
+    # One route evaluation feeds both the fatigue scores and the display
+    routes = evaluate_itineraries(records, start_city)
+    cols = score_catalogue(records, start_city, fatigue_by="route", routes=routes)
+    family = cols["family"].tolist()
+    top = heapq.nlargest(k, range(len(records)), key=lambda i: (family[i], -i))
+
+    kid = cols["kid"].tolist()
+    senior = cols["senior"].tolist()
+    fatigue = cols["fatigue"].tolist()
+
+    ranked = []
+    for i in top:
+        ranked.append((records[i].to_dict(), {
+            "kid": kid[i],
+            "senior": senior[i],
+            "family": family[i],
+            "fatigue": FATIGUE_LABELS[fatigue[i]],
+            "route": routes[i],
+        }))
+    return len(records), ranked
+
+
+def rank_plans(k):
+    source = plan_source()
+    if source is None:
+        st.error("valid_plans.json not found. Run customized_plan_extractor.py first.")
+        return 0, []
+
+    return _rank_plans_cached(*source, nights_range, max_price, start_city, int(k))
+
+
+# -------------------------------------------------
+# RENDERING
+# -------------------------------------------------
+def plan_scores(plan, route):
+    # Fatigue follows the hardest driving day of the whole route
+    fatigue = route["fatigue"]
+    return {
+        "kid": kid_friendliness(plan),
+        "senior": senior_friendliness(fatigue, int(plan["Nights"])),
+        "family": family_score(plan),
+        "fatigue": fatigue,
+        "route": route,
+    }
+
+
+def render_place_details(places):
+    infos = get_place_intelligence_batch(places, month)
+
+    for place in places:
+        st.markdown(f"### 📍 {place}")
+
+        info = infos[place]
+
+        st.write("🌡 Temperature:", info["temperature"])
+        st.write("⛰ Altitude:", info["altitude"])
+        st.write("🗣 Language:", info["language"])
+        st.write("🍲 Local Food:", info["food"])
+        st.write("💸 Avg Cost:", info["avg_cost"])
+        st.write("👥 Crowd Density:", info["crowd_density"])
+        st.write("🌧 Monsoon Risk:", info["monsoon_risk"])
+
+
+def render_plan(i, plan, scores, lazy_details=False):
+    st.markdown(f"## {i}. {plan['Package Name']}")
+    st.write(f"🛏 Nights: {plan['Nights']} | 📅 Days: {plan['Days']}")
+    st.write(f"💰 Price: ₹{plan['Price Discounted']}")
+    st.write(f"🚌 Tour Type: {plan.get('Tour Type', 'N/A')}")
+    st.write(f"👶 Kid Score: {scores['kid']}/5")
+
+    route = scores["route"]
+    places = route["route"][1:]  # already-split destination names
+    st.write("🚗 Road Travel: " + " → ".join(route["route"]))
+
+    if route["max_day_km"] is not None:
+        unknown = f", {route['unknown_legs']} leg(s) unknown" if route["unknown_legs"] else ""
+        st.write(
+            f"🧭 Route: ~{route['total_km']} km total (~{route['total_hours']} h) | "
+            f"longest day ~{route['max_day_km']} km (~{route['max_day_hours']} h){unknown}"
+        )
+    st.write(f"🧠 Road Fatigue: {scores['fatigue']}")
+
+    st.write(f"🧓 Senior Friendliness: {scores['senior']}/5")
+    st.write(f"🏆 Family Score: {scores['family']}")
+
+    if plan.get("Facilities"):
+        st.write("🎯 Facilities:", ", ".join(plan["Facilities"]))
+
+    if lazy_details:
+        # Expander bodies always execute; a toggle only runs when opened
+        if st.checkbox("🌍 View Place Details", key=f"details_{i}_{plan['Package Name']}"):
+            with st.container(border=True):
+                render_place_details(places)
+    else:
+        with st.expander("🌍 View Place Details"):
+            render_place_details(places)
 
-        if plan.get("Facilities"):
-            st.write("🎯 Facilities:", ", ".join(plan["Facilities"]))
+    st.divider()
 
-        with st.expander("🌍 View Place Details"):
-            for dest in plan.get("Destinations", []):
-                place = dest.split("(")[0].strip()
-                st.markdown(f"### 📍 {place}")
 
-                info = get_place_intelligence(place, month)
+st.subheader("🏆 Results View")
+r1, r2, r3 = st.columns(3)
+with r1:
+    ranked_mode = st.checkbox("Rank by Family Score (Top-K)", value=False)
+with r2:
+    top_k = st.number_input("Top K", min_value=1, value=50, step=10, disabled=not ranked_mode)
+with r3:
+    page_size = st.number_input("Plans per page", min_value=1, value=10, disabled=not ranked_mode)
 
-                st.write("🌡 Temperature:", info["temperature"])
-                st.write("⛰ Altitude:", info["altitude"])
-                st.write("🗣 Language:", info["language"])
-                st.write("🍲 Local Food:", info["food"])
-                st.write("💸 Avg Cost:", info["avg_cost"])
-                st.write("👥 Crowd Density:", info["crowd_density"])
-                st.write("🌧 Monsoon Risk:", info["monsoon_risk"])
 
-        st.divider()
+if st.button("🔍 Find Best Plans"):
+    st.session_state["searched"] = True
+    st.session_state["results_page"] = 1
+
+    if not ranked_mode:
+        records = query_records()
+
+        st.success(f"{len(records)} plans found")
+
+        routes = evaluate_itineraries(records, start_city)
+        for i, (record, route) in enumerate(zip(records, routes), 1):
+            plan = record.to_dict()
+            render_plan(i, plan, plan_scores(plan, route))
+
+# Ranked results survive reruns (page flips, detail toggles)
+if ranked_mode and st.session_state.get("searched"):
+    total, ranked = rank_plans(top_k)
+    st.success(f"{total} plans found — showing top {len(ranked)} by Family Score")
+
+    if ranked:
+        pages = math.ceil(len(ranked) / page_size)
+        if st.session_state.get("results_page", 1) > pages:
+            st.session_state["results_page"] = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, key="results_page")
+        st.caption(f"Page {page} of {pages}")
+
+        first = (page - 1) * page_size
+        for i, (plan, scores) in enumerate(ranked[first:first + page_size], first + 1):
+            render_plan(i, plan, scores, lazy_details=True)
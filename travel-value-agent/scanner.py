@@ -1,11 +1,22 @@
 import os
 import json
 import ast
-from collections import defaultdict
+import argparse
+import re
+import hashlib
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.atomic_io import atomic_write_json
 
 PROJECT_ROOT = "."
 PY_FILES = []
 
+# Per-file results, reused while a file is unchanged (mtime, else sha256).
+# Bump CACHE_VERSION when an inspection's verdict can change.
+CACHE_FILE = os.path.join(PROJECT_ROOT, ".scanner_cache.json")
+CACHE_VERSION = 2
+
 # ---------------------------------
 # Discover Python files
 # ---------------------------------
@@ -49,7 +60,16 @@ def analyze_python_file(path):
         report["risks"].append(f"Syntax error: {e}")
         return report
 
-    for node in ast.walk(tree):
+    # One breadth-first pass (same visiting order as ast.walk), carrying
+    # the outermost enclosing FunctionDef so returns are attributed to it
+    todo = deque([(tree, None)])
+    while todo:
+        node, owner = todo.popleft()
+
+        inner_owner = owner
+        if owner is None and isinstance(node, ast.FunctionDef):
+            inner_owner = node.name
+        todo.extend((child, inner_owner) for child in ast.iter_child_nodes(node))
 
         # Function definitions
         if isinstance(node, ast.FunctionDef):
@@ -60,11 +80,7 @@ def analyze_python_file(path):
 
         # Return statements
         if isinstance(node, ast.Return):
-            fn = next(
-                (p.name for p in ast.walk(tree)
-                 if isinstance(p, ast.FunctionDef) and node in ast.walk(p)),
-                None
-            )
+            fn = owner
             if fn:
                 report["functions"][fn]["returns"].add(
                     infer_literal_type(node.value)
@@ -86,6 +102,104 @@ def analyze_python_file(path):
     return report
 
 
+# ---------------------------------
+# Batch analysis (process pool + per-file cache)
+# ---------------------------------
+def _report_to_json(report):
+    return {
+        "functions": {
+            fn: {"args": meta["args"], "returns": sorted(meta["returns"])}
+            for fn, meta in report["functions"].items()
+        },
+        "returns": {k: sorted(v) for k, v in report["returns"].items()},
+        "json_files_used": sorted(report["json_files_used"]),
+        "risks": report["risks"],
+    }
+
+
+def _report_from_json(data):
+    return {
+        "functions": {
+            fn: {"args": meta["args"], "returns": set(meta["returns"])}
+            for fn, meta in data["functions"].items()
+        },
+        "returns": defaultdict(set, {k: set(v) for k, v in data["returns"].items()}),
+        "json_files_used": set(data["json_files_used"]),
+        "risks": data["risks"],
+    }
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION}
+    return cache
+
+
+def save_cache(cache, path=CACHE_FILE):
+    atomic_write_json(path, cache)
+
+
+def analyze_python_files(paths, workers=1, cache=None):
+    """
+    {path: report} for every path, in order. With a cache dict (its
+    "python" section is updated in place), a file is re-analyzed only if
+    its mtime changed AND its content hash differs. workers > 1 spreads
+    the remaining files over a process pool.
+    """
+    section = cache.setdefault("python", {}) if cache is not None else {}
+    results, todo, hashes = {}, [], {}
+
+    for path in paths:
+        st = os.stat(path)
+        entry = section.get(path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            results[path] = _report_from_json(entry["report"])
+            continue
+
+        if entry:
+            hashes[path] = _sha256(path)
+            if entry["sha256"] == hashes[path]:
+                entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+                results[path] = _report_from_json(entry["report"])
+                continue
+        todo.append(path)
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = dict(zip(todo, pool.map(analyze_python_file, todo, chunksize=8)))
+    else:
+        fresh = {path: analyze_python_file(path) for path in todo}
+
+    for path, report in fresh.items():
+        results[path] = report
+        if cache is not None:
+            st = os.stat(path)
+            section[path] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": hashes.get(path) or _sha256(path),
+                "report": _report_to_json(report),
+            }
+
+    # Forget files that no longer exist
+    if cache is not None:
+        for path in list(section):
+            if not os.path.exists(path):
+                del section[path]
+
+    return {path: results[path] for path in paths}
+
+
 # ---------------------------------
 # JSON Inspection
 # ---------------------------------
@@ -106,17 +220,250 @@ def inspect_json(path):
     return info
 
 
+# Streaming inspection: the top level is read token by token; inside
+# nested containers only bracket events are handled in Python and
+# everything between them (strings included) is skipped by one regex match.
+_JSON_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SKIP_NESTED_RE = re.compile(r'[^"\[\]{}]*(?:' + _JSON_STRING + r'[^"\[\]{}]*)*')
+
+# First token of a value: punctuation, a whole string, or a bare scalar
+_JSON_TOKEN_RE = re.compile(r'\s*(?:([\[\]{},:])|(' + _JSON_STRING + r')|([^\s\[\]{},:"]+))')
+_JSON_INT_RE = re.compile(r"-?(?:0|[1-9]\d*)")
+_JSON_FLOAT_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_JSON_LITERALS = {
+    "true": "bool", "false": "bool", "null": "NoneType",
+    "NaN": "float", "Infinity": "float", "-Infinity": "float",  # json.load accepts these
+}
+_CLOSERS = {"[": "]", "{": "}"}
+
+
+def _scalar_type(text):
+    if text in _JSON_LITERALS:
+        return _JSON_LITERALS[text]
+    if _JSON_INT_RE.fullmatch(text):
+        return "int"
+    if _JSON_FLOAT_RE.fullmatch(text):
+        return "float"
+    raise ValueError(f"Invalid JSON value: {text[:40]!r}")
+
+
+class _JsonReader:
+    """
+    Chunked text buffer; only the unconsumed tail is kept.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def token(self):
+        """
+        (punct, is_string, scalar) of the next complete token, not consumed;
+        None at end of input.
+        """
+        while True:
+            m = _JSON_TOKEN_RE.match(self.buf, self.pos)
+            # A token touching the end of the buffer may continue in the next chunk
+            if (m is None or m.end() == len(self.buf)) and not self.eof:
+                self.fill()
+                continue
+            if m is None:
+                rest = self.buf[self.pos:].strip()
+                if rest:
+                    raise ValueError(f"Unexpected JSON text: {rest[:40]!r}")
+                return None
+            return m
+
+    def value_type(self):
+        """
+        Type name of the value starting here; strings and scalars are
+        consumed, containers are left for the bracket events.
+        """
+        m = self.token()
+        if m is None:
+            raise ValueError("Expecting value")
+        punct, string, scalar = m.groups()
+        if punct == "[":
+            kind = "list"
+        elif punct == "{":
+            kind = "dict"
+        elif punct:
+            raise ValueError(f"Unexpected {punct!r}")
+        else:
+            kind = "str" if string else _scalar_type(scalar)
+            self.pos = m.end()
+            return kind
+        self.pos = m.start(1)
+        return kind
+
+    def skip(self, pattern):
+        """
+        Advance to the next structural character; returns it, or None at
+        end of input.
+        """
+        while True:
+            self.pos = pattern.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) and self.buf[self.pos] != '"':
+                return self.buf[self.pos]
+            if self.eof:
+                if self.pos < len(self.buf):
+                    raise ValueError("Unterminated string")
+                return None
+            self.fill()
+
+
+def _expect(r, allowed, what):
+    """
+    Consume the next token, which must be one of the `allowed` punctuation
+    characters; returns it.
+    """
+    m = r.token()
+    if m is None or m.group(1) is None or m.group(1) not in allowed:
+        raise ValueError(f"Expecting {what}")
+    r.pos = m.end()
+    return m.group(1)
+
+
+def _skip_value(r):
+    """
+    Consume one value and return its type name. Containers are skipped by
+    bracket events only (balance and strings are checked, commas are not).
+    """
+    kind = r.value_type()
+    if kind in ("list", "dict"):
+        stack = [r.buf[r.pos]]
+        r.pos += 1
+        while stack:
+            c = r.skip(_SKIP_NESTED_RE)
+            if c is None:
+                raise ValueError("Truncated JSON document")
+            r.pos += 1
+            if c in _CLOSERS:
+                stack.append(c)
+            elif _CLOSERS[stack.pop()] != c:
+                raise ValueError(f"Unbalanced {c!r}")
+    return kind
+
+
+def _empty_container(r, closer):
+    m = r.token()
+    if m is not None and m.group(1) == closer:
+        r.pos = m.end()
+        return True
+    return False
+
+
+def inspect_json_stream(path, sample=5, chunk_size=1 << 16):
+    """
+    Same report as inspect_json() from one streaming pass in constant
+    memory: top-level elements are counted, not built, and only the first
+    `sample` are typed. The top level is fully checked (missing or
+    trailing commas, keys, colons); inside nested containers only strings
+    and bracket balance are, so e.g. a missing comma two levels down is
+    not reported.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        r = _JsonReader(f, chunk_size)
+
+        top = r.value_type()
+        info = {
+            "type": top,
+            "length": 0 if top == "list" else None,
+            "element_types": set(),
+        }
+
+        if top == "list":
+            r.pos += 1
+            if not _empty_container(r, "]"):
+                while True:
+                    kind = _skip_value(r)
+                    if info["length"] < sample:
+                        info["element_types"].add(kind)
+                    info["length"] += 1
+                    if _expect(r, ",]", "',' or ']'") == "]":
+                        break
+
+        elif top == "dict":
+            r.pos += 1
+            if not _empty_container(r, "}"):
+                while True:
+                    m = r.token()
+                    if m is None or m.group(2) is None:
+                        raise ValueError("Expecting property name")
+                    r.pos = m.end()
+                    _expect(r, ":", "':'")
+                    _skip_value(r)
+                    if _expect(r, ",}", "',' or '}'") == "}":
+                        break
+
+        if r.token() is not None:
+            raise ValueError("Extra data after top-level value")
+
+    return info
+
+
+def inspect_json_files(paths, stream=False, cache=None):
+    """
+    {path: info or Exception}. With a cache dict, its "json" section is a
+    manifest keyed on (mtime, size, mode): unchanged files are not reopened.
+    """
+    section = cache.setdefault("json", {}) if cache is not None else {}
+    inspect = inspect_json_stream if stream else inspect_json
+    results = {}
+
+    for path in paths:
+        st = os.stat(path)
+        entry = section.get(path)
+        if (entry and entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size and entry["stream"] == stream):
+            if "error" in entry:
+                results[path] = ValueError(entry["error"])
+            else:
+                results[path] = dict(entry["info"], element_types=set(entry["info"]["element_types"]))
+            continue
+
+        entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "stream": stream}
+        try:
+            info = inspect(path)
+        except Exception as e:
+            results[path] = e
+            entry["error"] = str(e)
+        else:
+            results[path] = info
+            entry["info"] = dict(info, element_types=sorted(info["element_types"]))
+        section[path] = entry
+
+    if cache is not None:
+        for path in list(section):
+            if not os.path.exists(path):
+                del section[path]
+
+    return results
+
+
 # ---------------------------------
 # MAIN SCAN
 # ---------------------------------
-def scan():
+def scan(workers=1, use_cache=True, stream_json=False):
     print("\n🔍 TRAVEL VALUE AGENT — INTELLIGENT SCAN\n")
 
+    cache = load_cache() if use_cache else None
+    analyses = analyze_python_files(PY_FILES, workers=workers, cache=cache)
+
     # 1️⃣ Python analysis
     print("🐍 CODE ANALYSIS:")
     for f in PY_FILES:
         print(f"\n▶ {f}")
-        analysis = analyze_python_file(f)
+        analysis = analyses[f]
 
         for fn, meta in analysis["functions"].items():
             print(f"  Function: {fn}")
@@ -130,21 +477,39 @@ def scan():
 
     # 2️⃣ JSON analysis
     print("\n🧾 JSON DATA ANALYSIS:")
+    json_paths = []
     for root, _, files in os.walk(PROJECT_ROOT):
         for f in files:
             if f.endswith(".json"):
                 path = os.path.join(root, f)
-                try:
-                    info = inspect_json(path)
-                    print(f"\n▶ {path}")
-                    print(json.dumps(info, indent=2))
-                except Exception as e:
-                    print(f"\n▶ {path}")
-                    print("  ❌ Invalid JSON:", e)
+                if os.path.abspath(path) != os.path.abspath(CACHE_FILE):
+                    json_paths.append(path)
+
+    for path, info in inspect_json_files(json_paths, stream=stream_json, cache=cache).items():
+        print(f"\n▶ {path}")
+        if isinstance(info, Exception):
+            print("  ❌ Invalid JSON:", info)
+        else:
+            print(json.dumps(info, indent=2, default=sorted))
+
+    if cache is not None:
+        save_cache(cache)
 
     print("\n✅ Intelligent scan complete.")
     print("➡ Future code changes will be based on THIS output only.\n")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan project code and JSON data.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for Python analysis (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"ignore and don't update {CACHE_FILE}")
+    parser.add_argument("--stream-json", action="store_true",
+                        help="inspect JSON incrementally (constant memory, large files)")
+    args = parser.parse_args(argv)
+    scan(workers=max(1, args.workers), use_cache=not args.no_cache, stream_json=args.stream_json)
+
+
 if __name__ == "__main__":
-    scan()
+    main()
@@ -0,0 +1,187 @@
+# schema/output_schema.py
+# Typed in-memory form of one valid_plans.json entry
+#
+# The JSON contract (list of dicts, string values) stays as is. Plan is
+# what hot paths work on: numbers parsed once, destinations pre-split into
+# (place, nights) tuples, repeated strings interned, and __slots__ instead
+# of a per-plan dict. to_dict() gives back an equal contract dict.
+
+import re
+import sys
+
+CONTRACT_KEYS = (
+    "Package Name", "Nights", "Days", "Destinations", "Tour Type",
+    "Facilities", "Price Original", "Price Discounted", "Discount",
+)
+
+_INT_FIELDS = (
+    ("nights", "Nights"),
+    ("days", "Days"),
+    ("price_original", "Price Original"),
+    ("price_discounted", "Price Discounted"),
+)
+
+NIGHTS_IN_DEST_RE = re.compile(r"\((\d+)N\)")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _to_int(value):
+    """
+    Same parse the consumers used to do with int(); None if it fails.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def split_destination(dest: str):
+    """
+    "Dehradun (1N)" → ("Dehradun", 1); nights is None if absent.
+    The place is split exactly as the UI always did (text before "(").
+    """
+    m = NIGHTS_IN_DEST_RE.search(dest)
+    return sys.intern(dest.split("(")[0].strip()), (int(m.group(1)) if m else None)
+
+
+class Plan:
+    """
+    plan = Plan.from_dict(d)
+    plan.nights, plan.price_discounted        → int (None if not a number)
+    plan.destinations                          → (("Dehradun", 1), ("Sersi", 1), ...)
+    plan.to_dict() == d                        → True
+
+    Values that would not survive the typed form unchanged (e.g. "05" is
+    5 but prints back as "5", odd destination spelling, extra or missing
+    keys) are kept in `raw` and restored by to_dict().
+    """
+
+    __slots__ = (
+        "name", "nights", "days", "destinations", "tour_type", "facilities",
+        "price_original", "price_discounted", "discount", "raw",
+    )
+
+    def __init__(
+        self, name, nights, days, destinations=(), tour_type=None, facilities=(),
+        price_original=None, price_discounted=None, discount=None, raw=None,
+    ):
+        self.name = name
+        self.nights = nights
+        self.days = days
+        self.destinations = tuple(destinations)
+        self.tour_type = _intern(tour_type)
+        self.facilities = tuple(_intern(f) for f in facilities)
+        self.price_original = price_original
+        self.price_discounted = price_discounted
+        self.discount = _intern(discount)
+        self.raw = raw
+
+    # -------------------------
+    # Contract round-trip
+    # -------------------------
+    @classmethod
+    def from_dict(cls, d):
+        raw = {}
+
+        ints = {}
+        for attr, key in _INT_FIELDS:
+            value = d.get(key)
+            ints[attr] = _to_int(value)
+            if _int_text(ints[attr]) != value:
+                raw[key] = value  # e.g. "05", " 12" or a non-string
+
+        dests = d.get("Destinations", [])
+        if not isinstance(dests, list):
+            raw["Destinations"] = dests
+            dests = []
+        pairs = tuple(split_destination(x) for x in dests)
+        if any(_format_destination(place, n) != x for (place, n), x in zip(pairs, dests)):
+            raw["Destinations"] = list(dests)
+
+        facilities = d.get("Facilities", [])
+        if not isinstance(facilities, list):
+            raw["Facilities"] = facilities
+            facilities = ()
+
+        missing = [k for k in CONTRACT_KEYS if k not in d]
+        if missing:
+            raw["__missing__"] = missing
+        extra = {k: v for k, v in d.items() if k not in CONTRACT_KEYS}
+        if extra:
+            raw["__extra__"] = extra
+
+        return cls(
+            name=d.get("Package Name"),
+            destinations=pairs,
+            tour_type=d.get("Tour Type"),
+            facilities=facilities,
+            discount=d.get("Discount"),
+            raw=raw or None,
+            **ints,
+        )
+
+    def to_dict(self):
+        raw = self.raw or {}
+        d = {
+            "Package Name": self.name,
+            "Nights": _int_text(self.nights),
+            "Days": _int_text(self.days),
+            "Destinations": [_format_destination(place, n) for place, n in self.destinations],
+            "Tour Type": self.tour_type,
+            "Facilities": list(self.facilities),
+            "Price Original": _int_text(self.price_original),
+            "Price Discounted": _int_text(self.price_discounted),
+            "Discount": self.discount,
+        }
+        for key in CONTRACT_KEYS:
+            if key in raw:
+                d[key] = raw[key]
+        for key in raw.get("__missing__", ()):
+            del d[key]
+        d.update(raw.get("__extra__", {}))
+        return d
+
+    # -------------------------
+    # Convenience
+    # -------------------------
+    @property
+    def places(self):
+        return tuple(place for place, _ in self.destinations)
+
+    @property
+    def first_place(self):
+        return self.destinations[0][0] if self.destinations else None
+
+    def __eq__(self, other):
+        if not isinstance(other, Plan):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"Plan({self.name!r}, nights={self.nights}, "
+            f"price={self.price_discounted}, places={list(self.places)})"
+        )
+
+
+def _int_text(value):
+    return None if value is None else str(value)
+
+
+def _format_destination(place, nights):
+    return place if nights is None else f"{place} ({nights}N)"
+
+
+def plans_from_dicts(dicts):
+    return [Plan.from_dict(d) for d in dicts]
+
+
+def plans_to_dicts(plans):
+    return [p.to_dict() for p in plans]
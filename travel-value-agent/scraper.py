@@ -2,25 +2,63 @@
 # Robust Playwright scraper for JS-heavy websites (Windows-safe)
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+import argparse
+import asyncio
+import hashlib
 import json
+import os
+import re
 import time
 
+from web.page_readiness import (
+    print_timing_report,
+    wait_until_ready,
+    wait_until_ready_async,
+)
+from web.resource_blocker import ResourceBlocker
+
 URL = "https://www.thomascook.in/holidays/india-tour-packages/uttarakhand-tour-packages"
 OUTPUT_FILE = "scraped_output.json"
 
+# -------------------------
+# Batch mode settings
+# -------------------------
+BATCH_OUTPUT_DIR = os.path.join("data", "scraped")
+BATCH_CONCURRENCY = 4
+GOTO_TIMEOUT_MS = 60000
+BLOCK_RESOURCES = True
+
 
-def scrape():
+def _clean_lines(body_text):
     lines = []
+    for line in body_text.split("\n"):
+        clean = line.strip()
+        if clean:
+            lines.append(clean)
+    return lines
+
+
+def _write_lines(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(lines, f, ensure_ascii=False, indent=2)
+
+
+def scrape(block_resources=BLOCK_RESOURCES):
+    blocker = None
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
 
+        # Drop images / fonts / media / trackers — we only read text
+        if block_resources:
+            blocker = ResourceBlocker().install(page)
+
         # Load DOM only (do NOT wait for network idle)
-        page.goto(URL, wait_until="domcontentloaded", timeout=60000)
+        page.goto(URL, wait_until="domcontentloaded", timeout=GOTO_TIMEOUT_MS)
 
-        # Give JS time to render cards
-        time.sleep(8)
+        # Wait for package cards to render and settle (bounded)
+        timing = wait_until_ready(page)
 
         try:
             body_text = page.locator("body").inner_text()
@@ -29,14 +67,168 @@ def scrape():
 
         browser.close()
 
-    for line in body_text.split("\n"):
-        clean = line.strip()
-        if clean:
-            lines.append(clean)
+    _write_lines(OUTPUT_FILE, _clean_lines(body_text))
+    print_timing_report([{"url": URL, **timing}])
+    if blocker:
+        print(f"🛡 {URL} — {blocker.summary()}")
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(lines, f, ensure_ascii=False, indent=2)
+
+# -------------------------
+# Batch mode (one browser, many URLs)
+# -------------------------
+def output_path_for(url, output_dir=BATCH_OUTPUT_DIR):
+    """
+    Stable, filesystem-safe output name for a URL. The short hash of the
+    full URL keeps URLs that only differ past the cut (or in punctuation)
+    from sharing a file.
+    """
+    slug = re.sub(r"^https?://", "", url).strip("/")
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", slug).strip("_")
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(output_dir, f"{slug[:150] or 'page'}_{digest}.json")
+
+
+def read_url_file(path):
+    """
+    One URL per line. Blank lines and # comments are ignored.
+    """
+    urls = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            clean = line.strip()
+            if clean and not clean.startswith("#"):
+                urls.append(clean)
+    return urls
+
+
+async def _scrape_one(browser, semaphore, url, output_dir, block_resources):
+    from playwright.async_api import TimeoutError as AsyncPlaywrightTimeout
+
+    async with semaphore:
+        started = time.perf_counter()
+        result = {"url": url, "output": output_path_for(url, output_dir),
+                  "lines": 0, "seconds": None, "ready": False,
+                  "ready_seconds": None, "blocking": None, "error": None}
+
+        # Fresh context per URL: no cookies / storage leak between pages
+        context = await browser.new_context()
+        try:
+            if block_resources:
+                blocker = await ResourceBlocker().install_async(context)
+                result["blocking"] = blocker.stats
+
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=GOTO_TIMEOUT_MS)
+
+            # Wait for package cards to render and settle (bounded)
+            timing = await wait_until_ready_async(page)
+            result["ready"] = timing["ready"]
+            result["ready_seconds"] = timing["seconds"]
+
+            try:
+                body_text = await page.locator("body").inner_text()
+            except AsyncPlaywrightTimeout:
+                body_text = ""
+
+            lines = _clean_lines(body_text)
+            _write_lines(result["output"], lines)
+            result["lines"] = len(lines)
+        except Exception as e:
+            result["error"] = str(e)
+        finally:
+            await context.close()
+
+        result["seconds"] = round(time.perf_counter() - started, 2)
+        return result
+
+
+async def scrape_many_async(
+    urls,
+    output_dir=BATCH_OUTPUT_DIR,
+    concurrency=BATCH_CONCURRENCY,
+    block_resources=BLOCK_RESOURCES,
+):
+    """
+    Scrape many URLs with ONE shared Chromium and at most
+    `concurrency` pages open at a time. Writes one output per URL;
+    repeated URLs are scraped once (first-seen order).
+    """
+    from playwright.async_api import async_playwright
+
+    urls = list(dict.fromkeys(urls))
+
+    os.makedirs(output_dir, exist_ok=True)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            results = await asyncio.gather(
+                *(
+                    _scrape_one(browser, semaphore, url, output_dir, block_resources)
+                    for url in urls
+                )
+            )
+        finally:
+            await browser.close()
+
+    return list(results)
+
+
+def scrape_many(
+    urls,
+    output_dir=BATCH_OUTPUT_DIR,
+    concurrency=BATCH_CONCURRENCY,
+    block_resources=BLOCK_RESOURCES,
+):
+    started = time.perf_counter()
+    results = asyncio.run(
+        scrape_many_async(urls, output_dir, concurrency, block_resources)
+    )
+    elapsed = time.perf_counter() - started
+
+    for r in results:
+        if r["error"]:
+            print(f"❌ {r['url']} — {r['error']}")
+        else:
+            print(f"✅ {r['url']} → {r['output']} ({r['lines']} lines, {r['seconds']}s)")
+    print(f"📦 {len(results)} pages in {elapsed:.1f}s (concurrency={concurrency})")
+
+    print_timing_report([
+        {"url": r["url"], "ready": r["ready"], "seconds": r["ready_seconds"]}
+        for r in results if r["ready_seconds"] is not None
+    ])
+
+    blocked = [r["blocking"] for r in results if r["blocking"]]
+    if blocked:
+        saved = sum(b["est_bytes_saved"] for b in blocked)
+        count = sum(b["requests_blocked"] for b in blocked)
+        print(f"🛡 Blocked {count} requests (~{saved / 1e6:.1f} MB est. saved) across {len(blocked)} page(s)")
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape package listing pages.")
+    parser.add_argument("urls", nargs="*", help="URLs to scrape in batch mode")
+    parser.add_argument("--url-file", help="file with one URL per line")
+    parser.add_argument("--output-dir", default=BATCH_OUTPUT_DIR)
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--no-block", action="store_true",
+                        help="load images, fonts, media and trackers too")
+    args = parser.parse_args(argv)
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls.extend(read_url_file(args.url_file))
+
+    # No URLs → original single-page behaviour
+    if not urls:
+        scrape(block_resources=not args.no_block)
+        return
+
+    scrape_many(urls, args.output_dir, args.concurrency, block_resources=not args.no_block)
 
 
 if __name__ == "__main__":
-    scrape()
+    main()
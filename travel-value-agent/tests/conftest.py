@@ -0,0 +1,32 @@
+# tests/conftest.py
+# Shared helpers: project root on sys.path + a local stand-in HTTP server
+
+import contextlib
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@contextlib.contextmanager
+def local_server(handler_cls):
+    """
+    Serve `handler_cls` on 127.0.0.1 (free port) in a background thread.
+    Yields the base URL, e.g. "http://127.0.0.1:54321/".
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
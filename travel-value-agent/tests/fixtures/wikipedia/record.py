@@ -0,0 +1,33 @@
+# tests/fixtures/wikipedia/record.py
+# (Re-)record article fixtures for tests/test_infobox_parsing.py (needs network)
+#
+#   python tests/fixtures/wikipedia/record.py Nainital Haridwar "Kedarnath Temple"
+#
+# Pages are saved verbatim as <Title>.html next to this script; every
+# *.html here is picked up by the equivalence test.
+
+import os
+import sys
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(HERE)))
+
+from engine.sources.wikipedia_source import USER_AGENT, WIKI_BASE  # noqa: E402
+
+
+def record(title):
+    name = title.replace(" ", "_")
+    resp = requests.get(WIKI_BASE + name, headers={"User-Agent": USER_AGENT}, timeout=30)
+    resp.raise_for_status()
+    path = os.path.join(HERE, f"{name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(resp.text)
+    return path, len(resp.text)
+
+
+if __name__ == "__main__":
+    for title in sys.argv[1:]:
+        path, size = record(title)
+        print(f"✅ {title} ({size / 1024:.0f} KB) → {path}")
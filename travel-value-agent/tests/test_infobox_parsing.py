@@ -0,0 +1,81 @@
+# tests/test_infobox_parsing.py
+# Targeted infobox parse (slice / SoupStrainer, lxml or html.parser) must
+# extract the same facts as the original full html.parser tree.
+
+import glob
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from engine.sources import wikipedia_source
+from engine.sources.wikipedia_source import find_infobox, parse_place_facts
+
+PAGES = sorted(glob.glob(os.path.join(FIXTURES, "wikipedia", "*.html")))
+
+PARSERS = ["html.parser"]
+try:
+    import lxml  # noqa: F401
+    PARSERS.append("lxml")
+except ImportError:
+    pass
+
+# Known facts per page; guards against both paths drifting together
+EXPECTED = {
+    "Dehradun": {"altitude_m": 640, "population_context": "High"},
+    "Haridwar": {"altitude_m": 314, "languages": ["Hindi", "Sanskrit", "Garhwali"],
+                 "population_context": "Medium"},
+    "Kedarnath_Temple": {"altitude_m": 3583, "languages": [], "population_context": "Unknown"},
+    "Nainital": {"altitude_m": 2084},
+    "Mussoorie": {"altitude_m": 1880, "languages": ["Hindi", "Garhwali", "Jaunsari"],
+                  "population_context": "Low"},
+}
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _facts(html, fast):
+    facts = parse_place_facts(html, fast=fast)
+    facts.pop("fetched_at")
+    return facts
+
+
+def _page_id(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("path", PAGES, ids=_page_id)
+def test_fast_path_matches_full_tree(path, parser, monkeypatch):
+    monkeypatch.setattr(wikipedia_source, "FAST_PARSER", parser)
+    html = _read(path)
+
+    assert find_infobox(html, fast=True) is not None
+    assert _facts(html, fast=True) == _facts(html, fast=False)
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("path", PAGES, ids=_page_id)
+def test_strainer_fallback_matches_full_tree(path, parser, monkeypatch):
+    # As if slicing had failed: the SoupStrainer pass must still find it
+    monkeypatch.setattr(wikipedia_source, "FAST_PARSER", parser)
+    monkeypatch.setattr(wikipedia_source, "_slice_infobox", lambda html: None)
+    html = _read(path)
+
+    assert find_infobox(html, fast=True) is not None
+    assert _facts(html, fast=True) == _facts(html, fast=False)
+
+
+@pytest.mark.parametrize("path", PAGES, ids=_page_id)
+def test_every_page_is_sliced(path):
+    assert wikipedia_source._slice_infobox(_read(path)) is not None
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_expected_facts(name):
+    facts = _facts(_read(os.path.join(FIXTURES, "wikipedia", f"{name}.html")), fast=False)
+    for key, value in EXPECTED[name].items():
+        assert facts[key] == value
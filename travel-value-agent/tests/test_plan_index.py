@@ -0,0 +1,29 @@
+# tests/test_plan_index.py
+# PlanIndex keeps only typed records but answers with contract dicts
+
+import json
+import os
+
+from conftest import ROOT
+from engine.plan_index import PlanIndex
+
+with open(os.path.join(ROOT, "data", "valid_plans.json"), encoding="utf-8") as f:
+    PLANS = json.load(f)
+
+
+def test_query_returns_the_contract_dicts():
+    index = PlanIndex(PLANS)
+
+    assert len(index) == len(PLANS)
+    assert index.query() == PLANS
+    assert not hasattr(index, "plans")
+
+
+def test_query_matches_records():
+    index = PlanIndex(iter(PLANS))
+    place = index.places()[0]
+
+    for kwargs in ({"nights_range": (3, 4)}, {"max_price": 100000}, {"destinations": [place]}):
+        dicts = index.query(**kwargs)
+        assert dicts == [r.to_dict() for r in index.query_records(**kwargs)]
+        assert dicts == [p for p in PLANS if p in dicts]
@@ -0,0 +1,69 @@
+# tests/test_plan_store.py
+# SQLite store must hold the same catalogue as valid_plans.json
+
+import json
+import sqlite3
+
+from engine.plan_store import SCHEMA_VERSION, PlanStore, export_json, sync_plans
+
+
+def _plan(name, nights, price, dests, tour_type="Group Tour"):
+    return {
+        "Package Name": name,
+        "Nights": str(nights),
+        "Days": str(nights + 1),
+        "Destinations": dests,
+        "Tour Type": tour_type,
+        "Facilities": ["Hotels", "Sightseeing"],
+        "Price Original": None,
+        "Price Discounted": str(price),
+        "Discount": None,
+    }
+
+
+PLANS = [
+    _plan("Mussoorie Escape", 3, 24500, ["Dehradun (1N)", "Mussoorie (2N)"]),
+    _plan("Nainital Lakes", 4, 31000, ["Nainital (2N)", "Ranikhet (2N)"]),
+    # Same (name, nights, discounted price) as the first plan
+    _plan("Mussoorie Escape", 3, 24500, ["Mussoorie (3N)"], tour_type="Private Tour"),
+]
+
+
+def test_duplicates_round_trip_like_the_json(tmp_path):
+    db, out = str(tmp_path / "plans.sqlite"), tmp_path / "plans.json"
+
+    summary = sync_plans(PLANS, db)
+    assert summary["inserted"] == 3
+    assert len(PlanStore(db)) == len(PLANS)
+
+    export_json(db, str(out))
+    assert json.loads(out.read_text(encoding="utf-8")) == PLANS
+    assert len(PlanStore(db).query(destinations=["Mussoorie"])) == 2
+
+
+def test_resync_matches_copies_in_order(tmp_path):
+    db = str(tmp_path / "plans.sqlite")
+    sync_plans(PLANS, db)
+
+    assert sync_plans(PLANS, db) == {"inserted": 0, "updated": 0, "unchanged": 3, "deleted": 0}
+
+    # Dropping the second copy deletes exactly one row
+    summary = sync_plans(PLANS[:2], db)
+    assert summary == {"inserted": 0, "updated": 0, "unchanged": 2, "deleted": 1}
+    assert PlanStore(db).all() == PLANS[:2]
+
+
+def test_older_schema_is_rebuilt(tmp_path):
+    db = str(tmp_path / "plans.sqlite")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE plans (id INTEGER PRIMARY KEY, package_name TEXT)")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    assert sync_plans(PLANS, db)["inserted"] == 3
+    assert PlanStore(db).all() == PLANS
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    conn.close()
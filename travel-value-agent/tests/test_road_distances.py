@@ -0,0 +1,35 @@
+# tests/test_road_distances.py
+# Road km from the compiled distance store
+
+from engine.distance_store import compile_store
+from engine.road_distance_agent import CITY_DISTANCES_KM, get_road_distance
+
+
+def test_listed_pairs_win_in_both_directions():
+    for (a, b), km in CITY_DISTANCES_KM.items():
+        assert get_road_distance(a, b) == km
+        assert get_road_distance(b, a) == km
+
+
+def test_distances_are_symmetric():
+    store = compile_store()
+    for a in store.names:
+        for b in store.names:
+            assert store.km_between(a, b) == store.km_between(b, a), (a, b)
+
+
+def test_unknown_place():
+    assert get_road_distance("Delhi", "Atlantis") is None
+
+
+def test_hours_are_symmetric_and_follow_km():
+    store = compile_store()
+    for a in store.names:
+        for b in store.names:
+            assert store.hours_between(a, b) == store.hours_between(b, a), (a, b)
+
+    # Measured on 300 km at 8.5 h; the listed road is 320 km
+    assert store.km_between("Delhi", "Nainital") == 320
+    assert store.hours_between("Delhi", "Nainital") == 9.1
+    # km unchanged → measured hours kept exactly
+    assert store.hours_between("Mussoorie", "Delhi") == 8
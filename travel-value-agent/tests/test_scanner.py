@@ -0,0 +1,33 @@
+# tests/test_scanner.py
+# --stream-json must agree with json.load on what is valid at the top level
+
+import pytest
+
+import scanner
+
+DOCUMENTS = [
+    "[]", "{}", " [ ] ", '"text"', "3", "[1,\n2\n]",
+    '[true, null, 1.5, "s", [1, 2], {"a": "]"}]',
+    '{"a": 1, "b": [1, 2]}',
+    # Invalid: json.load rejects all of these
+    "[1 2]", "[1,]", "[,1]", '{"a" 1}', '{"a": 1,}', '{"a": 1 "b": 2}', "{1: 2}",
+    '{"a"}', "[1]]", "[1] x", "[1, 2", '{"a":', '{"a": [}]}',
+]
+
+
+def _report(inspect, path, **kwargs):
+    try:
+        info = inspect(path, **kwargs)
+    except ValueError:
+        return "invalid"
+    return info["type"], info["length"], sorted(info["element_types"])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_stream_matches_json_load(text, chunk_size, tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text(text, encoding="utf-8")
+
+    expected = _report(scanner.inspect_json, str(path))
+    assert _report(scanner.inspect_json_stream, str(path), chunk_size=chunk_size) == expected
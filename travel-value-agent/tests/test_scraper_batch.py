@@ -0,0 +1,147 @@
+# tests/test_scraper_batch.py
+# scrape_many(): correctness + throughput against local fixture pages
+
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from conftest import FIXTURES, local_server  # noqa: E402
+import scraper  # noqa: E402
+
+PAGES = 8
+RESPONSE_DELAY_S = 0.3
+
+with open(os.path.join(FIXTURES, "scraper", "package_listing.html"), encoding="utf-8") as f:
+    TEMPLATE = f.read()
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """
+    /listing/<n> → fixture page n (slow response); anything else → 404.
+    Tracks how many page requests are in flight at once.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    image_hits = 0
+
+    @classmethod
+    def reset(cls):
+        cls.in_flight = cls.peak = cls.image_hits = 0
+
+    def do_GET(self):
+        cls = type(self)
+        if self.path.startswith("/assets/"):
+            # Only the image is a blocked resource type; the stylesheet
+            # is allowed through (and 404s harmlessly)
+            if self.path.endswith(".jpg"):
+                with cls.lock:
+                    cls.image_hits += 1
+            self.send_error(404)
+            return
+
+        if not self.path.startswith("/listing/"):
+            self.send_error(404)
+            return
+
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            time.sleep(RESPONSE_DELAY_S)
+            body = TEMPLATE.replace("{page}", self.path.rsplit("/", 1)[-1]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        if not os.path.exists(p.chromium.executable_path):
+            pytest.skip("Chromium not installed (python -m playwright install chromium)")
+
+    with local_server(ListingHandler) as url:
+        yield url
+
+
+def _run(urls, output_dir, concurrency):
+    ListingHandler.reset()
+    started = time.perf_counter()
+    results = asyncio.run(
+        scraper.scrape_many_async(urls, str(output_dir), concurrency=concurrency)
+    )
+    return results, time.perf_counter() - started
+
+
+def test_batch_writes_one_correct_output_per_url(base_url, tmp_path):
+    urls = [f"{base_url}listing/{n}" for n in range(PAGES)]
+    results, _ = _run(urls, tmp_path, concurrency=4)
+
+    assert [r["url"] for r in results] == urls
+    for n, r in enumerate(results):
+        assert r["error"] is None
+        assert r["ready"] is True
+        assert r["output"] == scraper.output_path_for(r["url"], str(tmp_path))
+
+        with open(r["output"], encoding="utf-8") as f:
+            lines = json.load(f)
+        assert r["lines"] == len(lines)
+        assert f"Page {n} Mussoorie Escape" in lines
+        assert f"Page {n} Nainital Lakes" in lines
+        assert "3 Nights / 4 Days" in lines
+        assert lines.count("VIEW DETAILS") == 2
+        # No cross-talk between concurrently scraped pages
+        assert not any(f"Page {m} " in line for line in lines for m in range(PAGES) if m != n)
+
+    # The banner image was blocked before reaching the server
+    assert ListingHandler.image_hits == 0
+
+
+def test_output_paths_do_not_collide(tmp_path):
+    base = "https://example.com/packages?" + "q=uttarakhand&" * 20
+    urls = [base + "page=1", base + "page=2", "https://example.com/a-b", "https://example.com/a_b"]
+    paths = [scraper.output_path_for(url, str(tmp_path)) for url in urls]
+
+    assert len(set(paths)) == len(urls)
+    assert paths[0] == scraper.output_path_for(urls[0], str(tmp_path))
+
+
+def test_duplicate_urls_are_scraped_once(base_url, tmp_path):
+    urls = [f"{base_url}listing/0", f"{base_url}listing/1", f"{base_url}listing/0"]
+    results, _ = _run(urls, tmp_path, concurrency=4)
+
+    assert [r["url"] for r in results] == urls[:2]
+    assert all(r["error"] is None for r in results)
+
+
+def test_batch_concurrency_is_bounded_and_faster(base_url, tmp_path):
+    urls = [f"{base_url}listing/{n}" for n in range(PAGES)]
+
+    _, sequential = _run(urls, tmp_path / "seq", concurrency=1)
+    assert ListingHandler.peak == 1
+
+    results, parallel = _run(urls, tmp_path / "par", concurrency=4)
+    assert 1 < ListingHandler.peak <= 4
+    assert all(r["error"] is None for r in results)
+
+    # Page waits overlap: well under the one-at-a-time time
+    assert parallel < sequential * 0.6
@@ -0,0 +1,203 @@
+# tests/test_wikipedia_fetcher.py
+# WikipediaFetcher against a local stand-in for en.wikipedia.org
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from conftest import local_server
+from engine.sources.place_master_refresh import refresh_place_master
+from engine.sources.wikipedia_source import TokenBucket, WikipediaFetcher
+
+ARTICLE = """<html><body>
+<table class="infobox ib-settlement vcard">
+<tr><th>Elevation</th><td>2,084 m (6,837 ft)</td></tr>
+<tr><th>Population (2011)</th><td>41,377</td></tr>
+<tr><th>Languages</th><td>Hindi, Kumaoni</td></tr>
+</table>
+<p>Article text.</p>
+</body></html>"""
+
+ETAG = '"rev-1"'
+
+
+class WikiHandler(BaseHTTPRequestHandler):
+    """
+    /wiki/Nainital → article with an ETag (304 when it matches)
+    /wiki/Flaky    → 503 on the first request, then the article
+    anything else  → 404
+    """
+
+    lock = threading.Lock()
+    hits = Counter()
+    conditional = Counter()
+
+    @classmethod
+    def reset(cls):
+        cls.hits.clear()
+        cls.conditional.clear()
+
+    def do_GET(self):
+        cls = type(self)
+        page = self.path.rsplit("/", 1)[-1]
+        with cls.lock:
+            cls.hits[page] += 1
+            n = cls.hits[page]
+            if self.headers.get("If-None-Match"):
+                cls.conditional[page] += 1
+
+        if page == "Flaky" and n == 1:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if page not in ("Nainital", "Flaky"):
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        body = ARTICLE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def wiki_url():
+    with local_server(WikiHandler) as url:
+        yield url + "wiki/"
+
+
+@pytest.fixture
+def make_fetcher(wiki_url, tmp_path):
+    WikiHandler.reset()
+    fetchers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("cache_dir", str(tmp_path / "wiki_cache"))
+        kwargs.setdefault("backoff_s", 0.01)
+        kwargs.setdefault("rate_per_s", 1000)
+        fetcher = WikipediaFetcher(base_url=wiki_url, **kwargs)
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.close()
+
+
+def test_fresh_cache_hit_makes_no_request(make_fetcher):
+    fetcher = make_fetcher()
+    first = fetcher.fetch("Nainital")
+    assert first["altitude_m"] == 2084
+    assert first["languages"] == ["Hindi", "Kumaoni"]
+    assert first["population_context"] == "Low"
+
+    # New fetcher, same cache dir: served from disk
+    again = make_fetcher().fetch("Nainital")
+    assert again == first
+    assert WikiHandler.hits["Nainital"] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(make_fetcher):
+    make_fetcher().fetch("Nainital")
+
+    fetcher = make_fetcher(ttl=timedelta(0))
+    first_fetched_at = fetcher._load_cached("Nainital")["facts"]["fetched_at"]
+    time.sleep(0.01)
+    facts = fetcher.fetch("Nainital")
+
+    assert WikiHandler.hits["Nainital"] == 2
+    assert WikiHandler.conditional["Nainital"] == 1
+    assert fetcher.stats["not_modified"] == 1
+    assert fetcher.stats["downloads"] == 0
+    assert facts["altitude_m"] == 2084
+    assert facts["fetched_at"] > first_fetched_at
+    assert fetcher._load_cached("Nainital")["facts"]["fetched_at"] == facts["fetched_at"]
+
+
+def test_missing_article_returns_none(make_fetcher):
+    fetcher = make_fetcher()
+    assert fetcher.fetch("No Such Place") is None
+    assert fetcher.stats["errors"] == 1
+    assert fetcher.stats["retries"] == 0
+
+
+def test_503_is_retried(make_fetcher):
+    fetcher = make_fetcher()
+    facts = fetcher.fetch("Flaky")
+
+    assert facts["altitude_m"] == 2084
+    assert WikiHandler.hits["Flaky"] == 2
+    assert fetcher.stats["retries"] == 1
+    assert fetcher.stats["downloads"] == 1
+
+
+def test_refresh_keeps_comma_formatted_elevation(make_fetcher, tmp_path):
+    master_file = tmp_path / "place_master.json"
+    master_file.write_text(json.dumps({
+        "Nainital": {"altitude_m": 2084, "family_note": "Lake walks"},
+    }), encoding="utf-8")
+
+    summary = refresh_place_master(
+        places=["Nainital", "No Such Place"],
+        master_file=str(master_file),
+        fetcher=make_fetcher(),
+    )
+
+    master = json.loads(master_file.read_text(encoding="utf-8"))
+    assert summary["updated"] == ["Nainital"]
+    assert summary["missing"] == ["No Such Place"]
+    assert master["Nainital"]["altitude_m"] == 2084
+    assert master["Nainital"]["languages"] == ["Hindi", "Kumaoni"]
+    assert master["Nainital"]["family_note"] == "Lake walks"
+
+
+def test_token_bucket_bounds_rate():
+    rate, burst, calls = 20.0, 2, 12
+    bucket = TokenBucket(rate, burst)
+
+    started = time.monotonic()
+    for _ in range(calls):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    # Burst is free, every further call waits for a new token
+    assert elapsed >= (calls - burst) / rate * 0.95
+    assert elapsed < (calls - burst) / rate + 0.5
+
+
+def test_token_bucket_is_shared_across_threads():
+    rate, burst = 50.0, 1
+    bucket = TokenBucket(rate, burst)
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert time.monotonic() - started >= (20 - burst) / rate * 0.95
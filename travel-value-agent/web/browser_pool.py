@@ -0,0 +1,109 @@
+# web/browser_pool.py
+# Long-lived Chromium pool for WebPageReader
+#
+# Keeps `size` browser processes warm and hands out a fresh, isolated
+# BrowserContext per read. A process is recycled after `max_uses` reads
+# or as soon as it is found disconnected (crash / OOM kill).
+#
+# Playwright's sync API is thread-bound: use one pool per thread.
+
+from contextlib import contextmanager
+
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
+
+
+class BrowserPool:
+    """
+    with BrowserPool(size=2, max_uses=50) as pool:
+        for url in urls:
+            lines = WebPageReader(url, pool=pool).get_visible_text()
+    """
+
+    def __init__(self, size: int = 1, max_uses: int = 50, headless: bool = True):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.headless = headless
+
+        self._playwright = None
+        self._slots = [{"browser": None, "uses": 0} for _ in range(self.size)]
+        self._next = 0
+
+        self.launches = 0
+        self.recycles = 0
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        return self
+
+    def close(self):
+        for slot in self._slots:
+            self._retire(slot)
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _retire(self, slot):
+        browser = slot["browser"]
+        slot["browser"] = None
+        slot["uses"] = 0
+        if browser is None:
+            return
+        try:
+            browser.close()
+        except PlaywrightError:
+            pass  # already dead
+
+    def _browser_for(self, slot):
+        browser = slot["browser"]
+        if browser is not None and not browser.is_connected():
+            self._retire(slot)
+            self.recycles += 1
+            browser = None
+
+        if browser is None:
+            browser = self._playwright.chromium.launch(headless=self.headless)
+            slot["browser"] = browser
+            self.launches += 1
+        return browser
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    @contextmanager
+    def context(self, **context_options):
+        """
+        Yield a fresh BrowserContext on a warm browser (round-robin).
+        """
+        if self._playwright is None:
+            self.start()
+
+        slot = self._slots[self._next]
+        self._next = (self._next + 1) % self.size
+
+        browser = self._browser_for(slot)
+        ctx = browser.new_context(**context_options)
+        try:
+            yield ctx
+        finally:
+            try:
+                ctx.close()
+            except PlaywrightError:
+                pass  # browser went away mid-read; recycled below
+
+            slot["uses"] += 1
+            if slot["uses"] >= self.max_uses or not browser.is_connected():
+                self._retire(slot)
+                self.recycles += 1
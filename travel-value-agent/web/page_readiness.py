@@ -0,0 +1,109 @@
+# web/page_readiness.py
+# Selector-driven page readiness (replaces fixed sleeps / networkidle)
+#
+# A page is "ready" when the package-card markers the extractor relies on
+# are present AND the body text has stopped changing for a quiet window.
+# A hard upper bound always applies; on timeout we read what is there.
+
+import time
+
+# Markers used by customized_plan_extractor (end-of-plan + duration line)
+PACKAGE_CARD_MARKERS = ("VIEW DETAILS",)
+PACKAGE_CARD_PATTERN = r"\d+\s+Nights"
+
+QUIET_WINDOW_MS = 750
+POLL_INTERVAL_MS = 100
+MAX_WAIT_MS = 15000
+
+# Evaluated inside the page on every poll. Keeps its stability state on
+# `window` so the predicate itself stays stateless from Python's side.
+_READY_JS = """
+([markers, pattern, quietMs]) => {
+    const text = document.body ? document.body.innerText : "";
+    if (!markers.every(m => text.includes(m))) return false;
+    if (pattern && !new RegExp(pattern).test(text)) return false;
+
+    const now = Date.now();
+    const s = window.__tvaReady || (window.__tvaReady = {len: -1, since: now});
+    if (text.length !== s.len) {
+        s.len = text.length;
+        s.since = now;
+        return false;
+    }
+    return now - s.since >= quietMs;
+}
+"""
+
+
+def _result(started, ready):
+    return {
+        "ready": ready,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def wait_until_ready(
+    page,
+    markers=PACKAGE_CARD_MARKERS,
+    pattern=PACKAGE_CARD_PATTERN,
+    quiet_ms=QUIET_WINDOW_MS,
+    max_wait_ms=MAX_WAIT_MS,
+):
+    """
+    Sync Playwright page. Returns {"ready": bool, "seconds": float}.
+    ready=False means the hard upper bound was hit.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+    started = time.perf_counter()
+    try:
+        page.wait_for_function(
+            _READY_JS,
+            arg=[list(markers), pattern, quiet_ms],
+            polling=POLL_INTERVAL_MS,
+            timeout=max_wait_ms,
+        )
+    except PlaywrightTimeout:
+        return _result(started, False)
+    return _result(started, True)
+
+
+async def wait_until_ready_async(
+    page,
+    markers=PACKAGE_CARD_MARKERS,
+    pattern=PACKAGE_CARD_PATTERN,
+    quiet_ms=QUIET_WINDOW_MS,
+    max_wait_ms=MAX_WAIT_MS,
+):
+    """
+    Async Playwright page. Same contract as wait_until_ready().
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+    started = time.perf_counter()
+    try:
+        await page.wait_for_function(
+            _READY_JS,
+            arg=[list(markers), pattern, quiet_ms],
+            polling=POLL_INTERVAL_MS,
+            timeout=max_wait_ms,
+        )
+    except PlaywrightTimeout:
+        return _result(started, False)
+    return _result(started, True)
+
+
+def print_timing_report(timings):
+    """
+    timings: list of {"url", "ready", "seconds"} dicts.
+    """
+    if not timings:
+        return
+
+    print("\n⏱ TIME-TO-READY")
+    for t in sorted(timings, key=lambda t: t["seconds"], reverse=True):
+        flag = "✅" if t["ready"] else "⚠️ timeout"
+        print(f"  {t['seconds']:>6.2f}s  {flag}  {t['url']}")
+
+    total = sum(t["seconds"] for t in timings)
+    print(f"  avg {total / len(timings):.2f}s over {len(timings)} page(s)")
@@ -0,0 +1,132 @@
+# web/resource_blocker.py
+# Playwright request interception shared by scraper.py and WebPageReader
+#
+# We only ever read body.inner_text(), so images, fonts, media and
+# third-party analytics are pure cost. One ResourceBlocker per page
+# (or per fresh context) so the stats are per page.
+
+from urllib.parse import urlsplit
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+DENY_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "bat.bing.com",
+    "moengage.com",
+    "webengage.com",
+    "clevertap-prod.com",
+)
+
+# Aborted requests never transfer, so their size is unknown.
+# These are rough per-type averages used for the "saved" estimate.
+EST_BYTES_BY_TYPE = {
+    "image": 60_000,
+    "font": 40_000,
+    "media": 500_000,
+    "script": 30_000,
+    "stylesheet": 20_000,
+}
+EST_BYTES_DEFAULT = 5_000
+
+
+class ResourceBlocker:
+
+    def __init__(
+        self,
+        resource_types=BLOCKED_RESOURCE_TYPES,
+        deny_hosts=DENY_HOSTS,
+        est_bytes_by_type=EST_BYTES_BY_TYPE,
+    ):
+        self.resource_types = frozenset(resource_types)
+        self.deny_hosts = tuple(h.lower() for h in deny_hosts)
+        self.est_bytes_by_type = dict(est_bytes_by_type)
+
+        self.stats = {
+            "requests_allowed": 0,
+            "requests_blocked": 0,
+            "blocked_by_type": {},
+            "bytes_loaded": 0,
+            "est_bytes_saved": 0,
+        }
+
+    # -------------------------
+    # Decision
+    # -------------------------
+    def _denied_host(self, url):
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == h or host.endswith("." + h) for h in self.deny_hosts)
+
+    def should_block(self, url, resource_type):
+        if resource_type in self.resource_types:
+            return True
+        return self._denied_host(url)
+
+    def _decide(self, request):
+        rtype = request.resource_type
+        if not self.should_block(request.url, rtype):
+            self.stats["requests_allowed"] += 1
+            return False
+
+        by_type = self.stats["blocked_by_type"]
+        by_type[rtype] = by_type.get(rtype, 0) + 1
+        self.stats["requests_blocked"] += 1
+        self.stats["est_bytes_saved"] += self.est_bytes_by_type.get(rtype, EST_BYTES_DEFAULT)
+        return True
+
+    def _on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.stats["bytes_loaded"] += int(length)
+
+    # -------------------------
+    # Install (page or context)
+    # -------------------------
+    def install(self, target):
+        """
+        Sync Playwright Page or BrowserContext.
+        """
+        def handle(route):
+            if self._decide(route.request):
+                route.abort()
+            else:
+                route.continue_()
+
+        target.route("**/*", handle)
+        target.on("response", self._on_response)
+        return self
+
+    async def install_async(self, target):
+        """
+        Async Playwright Page or BrowserContext.
+        """
+        async def handle(route):
+            if self._decide(route.request):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await target.route("**/*", handle)
+        target.on("response", self._on_response)
+        return self
+
+    # -------------------------
+    # Reporting
+    # -------------------------
+    def summary(self):
+        s = self.stats
+        by_type = ", ".join(f"{k}={v}" for k, v in sorted(s["blocked_by_type"].items()))
+        return (
+            f"blocked {s['requests_blocked']} req (~{s['est_bytes_saved'] / 1e6:.1f} MB est. saved"
+            + (f"; {by_type}" if by_type else "")
+            + f"), loaded {s['requests_allowed']} req ({s['bytes_loaded'] / 1e6:.1f} MB)"
+        )
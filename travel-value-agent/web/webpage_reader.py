@@ -8,6 +8,9 @@ if sys.platform.startswith("win"):
 
 from playwright.sync_api import sync_playwright
 
+from web.page_readiness import wait_until_ready, PACKAGE_CARD_MARKERS, PACKAGE_CARD_PATTERN
+from web.resource_blocker import ResourceBlocker
+
 
 class WebPageReader:
     """
@@ -15,21 +18,53 @@ class WebPageReader:
     Works correctly on Windows with Python 3.12.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        ready_markers=PACKAGE_CARD_MARKERS,
+        ready_pattern=PACKAGE_CARD_PATTERN,
+        pool=None,
+        block_resources: bool = True,
+    ):
         self.url = url
+        # Optional web.browser_pool.BrowserPool; None = one browser per call
+        self.pool = pool
+        # Pass ready_markers=() / ready_pattern=None for non-listing pages:
+        # readiness then only waits for the body text to settle.
+        self.ready_markers = ready_markers
+        self.ready_pattern = ready_pattern
+        self.last_timing = None
+        # Only text is read: skip images / fonts / media / trackers
+        self.block_resources = block_resources
+        self.last_blocker = None
 
-    def get_visible_text(self) -> List[str]:
-        lines = []
+    def _install_blocker(self, target):
+        self.last_blocker = None
+        if self.block_resources:
+            self.last_blocker = ResourceBlocker().install(target)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+    def _read_body(self, page) -> str:
+        page.goto(self.url, wait_until="domcontentloaded", timeout=60000)
+        self.last_timing = wait_until_ready(
+            page, markers=self.ready_markers, pattern=self.ready_pattern
+        )
+        return page.locator("body").inner_text()
 
-            page.goto(self.url, timeout=60000)
-            page.wait_for_load_state("networkidle")
+    def get_visible_text(self) -> List[str]:
+        lines = []
 
-            body_text = page.locator("body").inner_text()
-            browser.close()
+        if self.pool is not None:
+            # Warm browser, fresh isolated context per read
+            with self.pool.context() as context:
+                self._install_blocker(context)
+                body_text = self._read_body(context.new_page())
+        else:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                page = browser.new_page()
+                self._install_blocker(page)
+                body_text = self._read_body(page)
+                browser.close()
 
         for line in body_text.split("\n"):
             clean_line = line.strip()